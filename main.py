@@ -2,16 +2,12 @@
 Main FastAPI application for University Chatbot
 """
 
-from dotenv import load_dotenv
-
-# Load environment variables from .env file at the very beginning
-load_dotenv()
-
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-import time
+import asyncio
+import os
 import uvicorn
 from src.api.routes import router
 from src.api.auth_routes import auth_router
@@ -29,6 +25,7 @@ from config.settings import (
     ALLOWED_ORIGINS,
     PDF_DIR,
     BASE_DIR,
+    ensure_dirs,
 )
 import shutil
 
@@ -41,6 +38,7 @@ async def lifespan(app: FastAPI):
     # Startup logic
     log.info("Starting University Chatbot API...")
     log.info(f"API documentation available at: http://{API_HOST}:{API_PORT}/docs")
+    ensure_dirs()
 
     # Ensure PDFs from the bundled repo are present in the mounted data volume
     try:
@@ -54,14 +52,22 @@ async def lifespan(app: FastAPI):
             and any(repo_pdfs.iterdir())
             and not any(target_pdfs.iterdir())
         ):
+            files = [
+                (src, target_pdfs / src.relative_to(repo_pdfs))
+                for src in repo_pdfs.rglob("*")
+                if src.is_file()
+            ]
+
+            # Create each destination directory once, shallowest first,
+            # instead of a recursive mkdir per copied file
+            dest_dirs = {os.path.normpath(dest.parent) for _, dest in files}
+            for directory in sorted(dest_dirs, key=lambda d: d.count(os.sep)):
+                os.makedirs(directory, exist_ok=True)
+
             files_copied = 0
-            for src in repo_pdfs.rglob("*"):
-                if src.is_file():
-                    rel = src.relative_to(repo_pdfs)
-                    dest = target_pdfs / rel
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src, dest)
-                    files_copied += 1
+            for src, dest in files:
+                shutil.copy2(src, dest)
+                files_copied += 1
             log.info(
                 f"Copied {files_copied} PDF files from bundled repo to data volume: {target_pdfs}"
             )
@@ -94,21 +100,37 @@ app.add_middleware(
 )
 
 
+# Probe and docs endpoints hit by load balancers; not worth a log line each
+SKIP_LOG_PATHS = frozenset(
+    {
+        "/",
+        "/health",
+        "/api/v1/health",
+        "/api/v1/thammuu/health",
+        "/docs",
+        "/openapi.json",
+    }
+)
+
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all requests"""
-    start_time = time.time()
+    """Log all requests except health checks and docs"""
+    if request.url.path in SKIP_LOG_PATHS:
+        return await call_next(request)
 
-    # Log request
-    log.info(f"Request: {request.method} {request.url}")
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
     # Process request
     response = await call_next(request)
 
-    # Log response
-    process_time = time.time() - start_time
-    log.info(f"Response: {response.status_code} - {process_time:.3f}s")
+    # Log request and response as a single record
+    process_time = loop.time() - start_time
+    log.info(
+        f"{request.method} {request.url} -> {response.status_code} - {process_time:.3f}s"
+    )
 
     return response
 
@@ -164,8 +186,6 @@ async def health_check():
 
 
 if __name__ == "__main__":
-    import os
-
     # Support Railway PORT environment variable
     port = int(os.environ.get("PORT", API_PORT))
     host = os.environ.get("HOST", API_HOST)
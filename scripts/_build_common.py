@@ -0,0 +1,150 @@
+"""
+Index-building steps shared by the PDF ingestion and embedding build scripts
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import bm25s
+import numpy as np
+from src.services.hybrid_retrieval_service import tokenize_corpus
+from src.utils.logger import log
+from config.settings import BM25_INDEX_PATH
+
+
+# Texts encoded per pipeline step; finished steps queue for the writer
+EMBED_SLICE_SIZE = 512
+ENCODE_BATCH_SIZE = 64
+# Encoded slices allowed to wait for the writer before encoding pauses
+MAX_PENDING_WRITES = 4
+
+
+def embed_and_store(
+    embedding_service, db_service, chunk_ids, texts, disk_cache=None
+) -> np.ndarray:
+    """
+    Encode texts slice by slice while a writer thread stores finished slices
+
+    Texts already in the disk cache are not re-encoded, and
+    create_embeddings_batch encodes repeated texts within a slice once.
+    Encoding runs up to MAX_PENDING_WRITES slices ahead of the writer, so
+    slow database round trips are hidden behind model inference without
+    unbounded buffering.
+
+    Args:
+        embedding_service: Service used to encode the texts
+        db_service: Database service the embeddings are inserted into
+        chunk_ids: Chunk IDs aligned with texts
+        texts: Chunk contents to encode
+        disk_cache: Optional EmbeddingDiskCache consulted before encoding
+
+    Returns:
+        Array of all embedding vectors, in the order of texts
+    """
+    vectors = [None] * len(texts)
+    keys = []
+    if disk_cache:
+        keys = [disk_cache.make_key(text) for text in texts]
+        cached = disk_cache.get_many(keys)
+        vectors = [cached.get(key) for key in keys]
+
+    hits = [i for i, vector in enumerate(vectors) if vector is not None]
+    misses = [i for i, vector in enumerate(vectors) if vector is None]
+    log.info(f"Encoding {len(misses)}/{len(texts)} chunks not found in cache")
+
+    def store(indices: List[int], embeddings: np.ndarray, cache: bool):
+        db_service.insert_embeddings([chunk_ids[i] for i in indices], embeddings)
+        if cache:
+            disk_cache.put_many([keys[i] for i in indices], embeddings)
+
+    # A single writer keeps inserts ordered; SQLite takes one writer at a time
+    # anyway. Inference and database I/O both release the GIL
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        if hits:
+            hit_embeddings = np.vstack([vectors[i] for i in hits])
+            pending.append(writer.submit(store, hits, hit_embeddings, False))
+
+        for start in range(0, len(misses), EMBED_SLICE_SIZE):
+            slice_indices = misses[start : start + EMBED_SLICE_SIZE]
+            slice_embeddings = embedding_service.create_embeddings_batch(
+                [texts[i] for i in slice_indices], batch_size=ENCODE_BATCH_SIZE
+            )
+            for i, embedding in zip(slice_indices, slice_embeddings):
+                vectors[i] = embedding
+
+            pending.append(
+                writer.submit(
+                    store, slice_indices, slice_embeddings, disk_cache is not None
+                )
+            )
+            # Backpressure: wait for the writer rather than buffer every slice
+            while len(pending) > MAX_PENDING_WRITES:
+                pending.popleft().result()
+
+        # Surface any write error before returning
+        for future in pending:
+            future.result()
+
+    return np.vstack(vectors)
+
+
+def build_bm25_index(texts: List[str]):
+    """
+    Build the BM25 index over chunk texts and save it to BM25_INDEX_PATH
+
+    Uses the same tokenize_corpus as HybridRetrievalService, so saved and
+    in-process indexes score queries identically.
+
+    Args:
+        texts: Chunk contents to index
+    """
+    bm25 = bm25s.BM25()
+    bm25.index(tokenize_corpus(texts), show_progress=False)
+
+    # Saved as plain arrays that can be memory-mapped on load
+    bm25.save(BM25_INDEX_PATH, show_progress=False)
+    log.info(f"BM25 index with {len(texts)} chunks saved to {BM25_INDEX_PATH}")
+
+
+def update_faiss_index(faiss_service, db_service, chunk_ids, embeddings: np.ndarray):
+    """
+    Add newly embedded chunks to the saved FAISS index
+
+    The HNSW index accepts inserts but not removals, so the add-only path is
+    taken only when every chunk the saved index maps still has an embedding
+    in the database. Chunk IDs are never reused, so that check is enough to
+    rule out stale vectors. Every stored embedding is re-indexed when there
+    is no usable index or when chunks were deleted since it was built.
+
+    Args:
+        faiss_service: FAISS service holding the index
+        db_service: Database service to compare against and rebuild from
+        chunk_ids: IDs of the chunks embedded in this run
+        embeddings: Embedding vectors aligned with chunk_ids
+    """
+    if faiss_service.load_index() and faiss_service.dimension == embeddings.shape[1]:
+        known_ids = set(faiss_service.id_map.values())
+        stale = known_ids.difference(db_service.get_embedding_chunk_ids())
+        if not stale:
+            new = [
+                i for i, chunk_id in enumerate(chunk_ids) if chunk_id not in known_ids
+            ]
+            if new:
+                faiss_service.add_vectors(embeddings[new], [chunk_ids[i] for i in new])
+                faiss_service.save_index()
+            log.info(f"Added {len(new)} vectors to the existing FAISS index")
+            return
+        log.info(
+            f"FAISS index maps {len(stale)} chunks no longer in the database, "
+            f"rebuilding from the database"
+        )
+    else:
+        log.info("No compatible FAISS index found, rebuilding from the database")
+
+    all_chunk_ids, all_embeddings = db_service.get_all_embeddings()
+    if not all_chunk_ids:
+        log.error("No embeddings found in database")
+        return
+    faiss_service.rebuild_index(all_embeddings, all_chunk_ids)
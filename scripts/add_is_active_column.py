@@ -0,0 +1,69 @@
+"""
+Add is_active column to chunks table for soft-deactivating documents
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from src.services.postgres_database_service import get_db_engine
+from src.utils.logger import log
+from config.settings import DATABASE_POOLER_URL
+
+
+def main():
+    """Add chunks.is_active and a partial index over inactive chunks"""
+    try:
+        engine = get_db_engine(DATABASE_POOLER_URL)
+
+        with engine.connect() as conn:
+            # Fail fast instead of queueing behind other sessions' locks
+            conn.execute(text("SET LOCAL lock_timeout = '3s'"))
+            conn.execute(text("SET LOCAL statement_timeout = '60s'"))
+
+            # A constant DEFAULT is stored in the catalog on PostgreSQL 11+,
+            # so this does not rewrite the chunks table
+            log.info("Adding column: is_active")
+            conn.execute(
+                text(
+                    """
+                ALTER TABLE chunks
+                ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT TRUE NOT NULL
+                """
+                )
+            )
+            conn.commit()
+            log.info("✅ Column is_active is present")
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            # No transaction to scope SET LOCAL to; limit only the lock wait,
+            # since a concurrent build legitimately takes a while
+            conn.execute(text("SET lock_timeout = '3s'"))
+
+            # Nearly every chunk is active, so only index the inactive ones
+            log.info("Creating index: idx_chunks_is_active")
+            conn.execute(
+                text(
+                    """
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_is_active
+                ON chunks(is_active) WHERE is_active = false
+                """
+                )
+            )
+            log.info("✅ Index idx_chunks_is_active is present")
+
+    except Exception as e:
+        log.error(f"❌ Error in migration: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    log.info("Starting migration to add is_active column...")
+    main()
+    log.info("Migration completed!")
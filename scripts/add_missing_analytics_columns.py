@@ -8,53 +8,69 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import create_engine, text
-from config.settings import DATABASE_URL
+from sqlalchemy import text
+from src.services.postgres_database_service import get_db_engine
 from src.utils.logger import log
+from config.settings import DATABASE_POOLER_URL
+
+TABLE_NAME = "user_sessions"
 
 
 def add_missing_columns():
     """Add missing columns to user_sessions table"""
     try:
-        engine = create_engine(DATABASE_URL)
+        engine = get_db_engine(DATABASE_POOLER_URL)
 
         with engine.connect() as conn:
+            # Fail fast instead of queueing behind other sessions' locks
+            conn.execute(text("SET LOCAL lock_timeout = '3s'"))
+            conn.execute(text("SET LOCAL statement_timeout = '60s'"))
+
             # Check if columns exist and add if missing
             columns_to_add = [
-                ("user_segment", "VARCHAR(50) DEFAULT 'new'"),
+                ("user_segment", "TEXT DEFAULT 'new'"),
                 ("total_likes", "INTEGER DEFAULT 0"),
                 ("total_dislikes", "INTEGER DEFAULT 0"),
             ]
 
+            # Fetch existing columns once instead of probing the catalog per column
+            result = conn.execute(
+                text(
+                    """
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_name = :table_name
+                """
+                ),
+                {"table_name": TABLE_NAME},
+            )
+            existing_columns = {row[0] for row in result}
+
+            # Identifiers cannot be bound parameters, so quote them explicitly
+            quote = conn.dialect.identifier_preparer.quote
+
+            missing_columns = []
             for column_name, column_def in columns_to_add:
-                try:
-                    # Check if column exists
-                    result = conn.execute(
-                        text(
-                            f"""
-                        SELECT column_name 
-                        FROM information_schema.columns 
-                        WHERE table_name = 'user_sessions' 
-                        AND column_name = '{column_name}'
-                        """
-                        )
-                    )
-
-                    if result.fetchone() is None:
-                        # Column doesn't exist, add it
-                        log.info(f"Adding column: {column_name}")
-                        conn.execute(
-                            text(
-                                f"ALTER TABLE user_sessions ADD COLUMN {column_name} {column_def}"
-                            )
-                        )
-                        conn.commit()
-                        log.info(f"✅ Successfully added column: {column_name}")
-                    else:
-                        log.info(f"✓ Column already exists: {column_name}")
+                if column_name in existing_columns:
+                    log.info(f"✓ Column already exists: {column_name}")
+                else:
+                    missing_columns.append((column_name, column_def))
 
+            if missing_columns:
+                # One ALTER TABLE with several ADD COLUMN clauses takes the
+                # table lock and rewrites the catalog once
+                add_clauses = ", ".join(
+                    f"ADD COLUMN IF NOT EXISTS {quote(column_name)} {column_def}"
+                    for column_name, column_def in missing_columns
+                )
+                names = ", ".join(column_name for column_name, _ in missing_columns)
+                try:
+                    log.info(f"Adding columns: {names}")
+                    conn.execute(text(f"ALTER TABLE {quote(TABLE_NAME)} {add_clauses}"))
+                    conn.commit()
+                    log.info(f"✅ Successfully added columns: {names}")
                 except Exception as e:
-                    log.error(f"❌ Error adding column {column_name}: {e}")
+                    log.error(f"❌ Error adding columns {names}: {e}")
                     conn.rollback()
 
         log.info("✅ All missing columns checked and added")
@@ -3,6 +3,7 @@ Script to build embeddings and FAISS index from processed chunks
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to path
@@ -11,23 +12,26 @@ sys.path.append(str(project_root))
 
 from src.services.pdf_processor import PDFProcessor
 from src.services.embedding_service import EmbeddingService
+from src.services.embedding_disk_cache import EmbeddingDiskCache
 from src.services.database_service import DatabaseService
-import pickle
-from rank_bm25 import BM25Okapi
 from src.services.faiss_service import FAISSService
 from src.utils.logger import log
-from config.settings import EMBEDDING_MODEL, BM25_INDEX_PATH
+from config.settings import EMBEDDING_MODEL, ensure_dirs
+from scripts._build_common import build_bm25_index, embed_and_store
 
 
 def main():
     """Main function to build embeddings and FAISS index"""
     log.info("Starting embedding and index building process...")
+    ensure_dirs()
 
     try:
         # Initialize services
         pdf_processor = PDFProcessor()
         embedding_service = EmbeddingService(model_name=EMBEDDING_MODEL)
-        db_service = DatabaseService()
+        # The database is cleared and fully reloaded, so a crash only means
+        # re-running the build; commits need not wait for fsync
+        db_service = DatabaseService(bulk_load=True)
         faiss_service = FAISSService()
 
         # Load processed chunks
@@ -44,34 +48,37 @@ def main():
         log.info("Clearing existing database data...")
         db_service.clear_all_data()
 
+        # Indexes are rebuilt once after the load instead of per insert
+        db_service.drop_indexes()
+
         # Insert chunks into database
         log.info("Inserting chunks into database...")
         chunk_ids = db_service.insert_chunks(chunks)
 
-        # Create embeddings
-        log.info("Creating embeddings...")
+        # Create embeddings and insert them into database
+        log.info("Creating and inserting embeddings...")
         texts = [chunk.content for chunk in chunks]
-        embeddings = embedding_service.create_embeddings_batch(texts, batch_size=16)
-
-        # Insert embeddings into database
-        log.info("Inserting embeddings into database...")
-        db_service.insert_embeddings(chunk_ids, embeddings)
-
-        # Create FAISS index
-        log.info("Creating FAISS index...")
-        faiss_service.create_index(embeddings, chunk_ids)
-
-        # Save FAISS index
-        log.info("Saving FAISS index...")
-        faiss_service.save_index()
-
-        # Create and save BM25 index
-        log.info("Creating and saving BM25 index...")
-        tokenized_corpus = [doc.split(" ") for doc in texts]
-        bm25 = BM25Okapi(tokenized_corpus)
-        with open(BM25_INDEX_PATH, "wb") as f:
-            pickle.dump(bm25, f)
-        log.info(f"BM25 index saved to {BM25_INDEX_PATH}")
+        disk_cache = EmbeddingDiskCache(model_name=embedding_service.model_name)
+        embeddings = embed_and_store(
+            embedding_service, db_service, chunk_ids, texts, disk_cache
+        )
+
+        def build_faiss_index():
+            faiss_service.create_index(embeddings, chunk_ids)
+            faiss_service.save_index()
+
+        # The database, FAISS and BM25 indexes do not depend on each other.
+        # SQLite and FAISS build in native code without holding the GIL, so
+        # the three builds overlap instead of running back to back
+        log.info("Creating database, FAISS and BM25 indexes...")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(db_service.create_indexes),
+                executor.submit(build_faiss_index),
+                executor.submit(build_bm25_index, texts),
+            ]
+        for future in futures:
+            future.result()
 
         # Print statistics
         db_stats = db_service.get_database_stats()
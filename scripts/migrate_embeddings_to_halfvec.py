@@ -0,0 +1,116 @@
+"""
+Convert embeddings to halfvec and build the HNSW vector index
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from src.services.postgres_database_service import (
+    MIN_PGVECTOR_VERSION,
+    get_db_engine,
+)
+from src.utils.logger import log
+from config.settings import (
+    EMBEDDING_DIMENSION,
+    PGVECTOR_HNSW_EF_CONSTRUCTION,
+    PGVECTOR_HNSW_M,
+)
+
+
+def main():
+    """Convert embeddings.embedding to halfvec and index it with HNSW"""
+    try:
+        engine = get_db_engine()
+
+        with engine.connect() as conn:
+            version = conn.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            ).scalar()
+            if version is None:
+                raise RuntimeError("pgvector extension is not installed")
+            major_minor = tuple(int(part) for part in version.split(".")[:2])
+            if major_minor < MIN_PGVECTOR_VERSION:
+                raise RuntimeError(
+                    f"pgvector {version} has no halfvec type; upgrade to 0.7 or later"
+                )
+            log.info(f"✓ pgvector {version}")
+
+            udt_name = conn.execute(
+                text(
+                    """
+                SELECT udt_name FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND table_name = 'embeddings'
+                  AND column_name = 'embedding'
+                """
+                )
+            ).scalar()
+
+            if udt_name == "vector":
+                # Fail fast instead of queueing behind other sessions' locks.
+                # The rewrite itself holds ACCESS EXCLUSIVE on embeddings
+                # until it commits, so run this outside peak hours
+                conn.execute(text("SET LOCAL lock_timeout = '3s'"))
+
+                # Indexes on the old type cannot be carried over
+                log.info("Converting embeddings.embedding to halfvec")
+                conn.execute(text("DROP INDEX IF EXISTS idx_embeddings_vector"))
+                conn.execute(text("DROP INDEX IF EXISTS idx_embeddings_hnsw"))
+                conn.execute(
+                    text(
+                        f"""
+                    ALTER TABLE embeddings
+                    ALTER COLUMN embedding TYPE halfvec({EMBEDDING_DIMENSION})
+                    USING CAST(embedding AS halfvec({EMBEDDING_DIMENSION}))
+                    """
+                    )
+                )
+                conn.commit()
+                log.info("✅ Column embedding is halfvec")
+            else:
+                log.info(f"✓ Column embedding is already {udt_name}")
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            # No transaction to scope SET LOCAL to; limit only the lock wait,
+            # since a concurrent build legitimately takes a while
+            conn.execute(text("SET lock_timeout = '3s'"))
+
+            # The IVFFlat index it replaces had its lists trained on an
+            # empty table
+            conn.execute(
+                text("DROP INDEX CONCURRENTLY IF EXISTS idx_embeddings_vector")
+            )
+
+            # A failed concurrent build leaves an INVALID index behind that
+            # IF NOT EXISTS would skip; drop it with DROP INDEX before re-running
+            log.info("Creating index: idx_embeddings_hnsw")
+            conn.execute(
+                text(
+                    f"""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_embeddings_hnsw
+                ON embeddings USING hnsw (embedding halfvec_cosine_ops)
+                WITH (
+                    m = {PGVECTOR_HNSW_M},
+                    ef_construction = {PGVECTOR_HNSW_EF_CONSTRUCTION}
+                )
+                """
+                )
+            )
+            log.info("✅ Index idx_embeddings_hnsw is present")
+
+    except Exception as e:
+        log.error(f"❌ Error in migration: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    log.info("Starting migration of embeddings to halfvec...")
+    main()
+    log.info("Migration completed!")
@@ -3,9 +3,9 @@ Script to incrementally process new PDFs from data/not_process folder
 and add them to existing database without losing current data
 """
 
-import json
+import dataclasses
 import sys
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 
@@ -14,13 +14,26 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from src.utils.logger import log
-from src.services.pdf_processor import PDFProcessor
+from src.services.pdf_processor import (
+    CHUNKS_FILENAME,
+    PDFProcessor,
+    append_chunk_records,
+    resolve_chunks_file,
+)
 from src.services.embedding_service import EmbeddingService
+from src.services.embedding_disk_cache import EmbeddingDiskCache
 from src.services.database_service import DatabaseService
 from src.services.faiss_service import FAISSService
-from config.settings import PROCESSED_DIR, EMBEDDING_MODEL, BM25_INDEX_PATH
-import pickle
-from rank_bm25 import BM25Okapi
+from config.settings import (
+    PROCESSED_DIR,
+    EMBEDDING_MODEL,
+    ensure_dirs,
+)
+from scripts._build_common import (
+    build_bm25_index,
+    embed_and_store,
+    update_faiss_index,
+)
 
 
 def get_processed_files() -> set:
@@ -52,11 +65,13 @@ def get_new_pdf_files(not_process_dir: Path, processed_files: set) -> List[Path]
 
 def backup_current_data():
     """Create backup of current chunks file"""
-    chunks_file = PROCESSED_DIR / "heading_chunks.json"
+    chunks_file = resolve_chunks_file(PROCESSED_DIR)
     if chunks_file.exists():
         import time
 
-        backup_file = PROCESSED_DIR / f"heading_chunks_backup_{int(time.time())}.json"
+        backup_file = PROCESSED_DIR / (
+            f"heading_chunks_backup_{int(time.time())}{chunks_file.suffix}"
+        )
         import shutil
 
         shutil.copy2(chunks_file, backup_file)
@@ -65,98 +80,29 @@ def backup_current_data():
     return None
 
 
-def load_existing_chunks() -> List[Dict[Any, Any]]:
-    """Load existing chunks from file"""
-    chunks_file = PROCESSED_DIR / "heading_chunks.json"
-    if chunks_file.exists():
-        try:
-            with open(chunks_file, "r", encoding="utf-8") as f:
-                chunks = json.load(f)
-            log.info(f"Loaded {len(chunks)} existing chunks")
-            return chunks
-        except Exception as e:
-            log.error(f"Error loading existing chunks: {e}")
-            return []
-    else:
-        log.warning("No existing chunks file found")
-        return []
-
-
-def save_updated_chunks(all_chunks: List[Dict[Any, Any]]):
-    """Save updated chunks to file"""
-    chunks_file = PROCESSED_DIR / "heading_chunks.json"
+def append_new_chunks(new_chunks: List[Dict[Any, Any]]):
+    """Append new chunks to the chunks file without rewriting existing ones"""
+    chunks_file = PROCESSED_DIR / CHUNKS_FILENAME
     try:
-        with open(chunks_file, "w", encoding="utf-8") as f:
-            json.dump(all_chunks, f, ensure_ascii=False, indent=4)
-        log.info(f"Saved {len(all_chunks)} chunks to {chunks_file}")
+        append_chunk_records(chunks_file, new_chunks)
+        log.info(f"Appended {len(new_chunks)} chunks to {chunks_file}")
     except Exception as e:
         log.error(f"Error saving chunks: {e}")
         raise
 
 
-def rebuild_faiss_index(
-    db_service: DatabaseService,
-    embedding_service: EmbeddingService,
-    faiss_service: FAISSService,
-):
-    """Rebuild FAISS index with all chunks including new ones"""
-    log.info("Rebuilding FAISS index...")
-
-    # Get all chunks from database
-    all_chunks = db_service.get_all_chunks()
-    if not all_chunks:
-        log.error("No chunks found in database")
-        return
-
-    log.info(f"Processing {len(all_chunks)} chunks for FAISS index")
-
-    # Create embeddings for all chunks
-    chunk_texts = [chunk["content"] for chunk in all_chunks]
-    chunk_ids = [chunk["id"] for chunk in all_chunks]
-
-    # Generate embeddings in batches
-    batch_size = 50
-    all_embeddings = []
-
-    for i in range(0, len(chunk_texts), batch_size):
-        batch_texts = chunk_texts[i : i + batch_size]
-        batch_embeddings = embedding_service.create_embeddings_batch(batch_texts)
-        all_embeddings.extend(batch_embeddings)
-        log.info(
-            f"Generated embeddings for batch {i//batch_size + 1}/{(len(chunk_texts) + batch_size - 1)//batch_size}"
-        )
-
-    # Rebuild FAISS index with all embeddings
-    all_embeddings_array = np.array(all_embeddings)
-    faiss_service.rebuild_index(all_embeddings_array, chunk_ids)
-
-    log.info("FAISS index rebuilt successfully")
-
-
-def rebuild_bm25_index():
+def rebuild_bm25_index(db_service: DatabaseService):
     """Rebuild BM25 index with all chunks"""
     log.info("Rebuilding BM25 index...")
 
     try:
-        db_service = DatabaseService()
         all_chunks = db_service.get_all_chunks()
 
         if not all_chunks:
             log.error("No chunks found for BM25 index")
             return
 
-        # Prepare texts for BM25
-        chunk_texts = [chunk["content"] for chunk in all_chunks]
-        tokenized_texts = [text.split() for text in chunk_texts]
-
-        # Create BM25 index
-        bm25 = BM25Okapi(tokenized_texts)
-
-        # Save BM25 index
-        with open(BM25_INDEX_PATH, "wb") as f:
-            pickle.dump(bm25, f)
-
-        log.info(f"BM25 index rebuilt with {len(chunk_texts)} chunks")
+        build_bm25_index([chunk["content"] for chunk in all_chunks])
 
     except Exception as e:
         log.error(f"Error rebuilding BM25 index: {e}")
@@ -166,6 +112,7 @@ def main():
     """Main function to incrementally process new PDFs"""
 
     log.info("Starting incremental PDF processing...")
+    ensure_dirs()
 
     try:
         # Define paths
@@ -196,8 +143,8 @@ def main():
         # Create backup
         backup_file = backup_current_data()
 
-        # Load existing chunks
-        existing_chunks = load_existing_chunks()
+        # Count existing chunks; the chunks file itself is only appended to
+        existing_count = db_service.get_chunk_count()
 
         # Process new PDF files
         new_chunks = []  # Keep original DocumentChunk objects for database operations
@@ -220,10 +167,7 @@ def main():
                 new_chunks.extend(chunks)
 
                 # Convert to dictionaries for JSON serialization
-                chunk_dicts = [
-                    chunk.model_dump() if hasattr(chunk, "model_dump") else chunk
-                    for chunk in chunks
-                ]
+                chunk_dicts = [dataclasses.asdict(chunk) for chunk in chunks]
                 new_chunks_for_json.extend(chunk_dicts)
 
             except Exception as e:
@@ -236,11 +180,8 @@ def main():
 
         log.info(f"Total new chunks created: {len(new_chunks)}")
 
-        # Combine existing and new chunks for JSON file
-        all_chunks_for_json = existing_chunks + new_chunks_for_json
-
-        # Save updated chunks file (using dictionaries)
-        save_updated_chunks(all_chunks_for_json)
+        # Append new chunks to the chunks file (using dictionaries)
+        append_new_chunks(new_chunks_for_json)
 
         # Insert new chunks into database
         log.info("Inserting new chunks into database...")
@@ -252,29 +193,34 @@ def main():
 
         log.info(f"Inserted {len(chunk_ids)} new chunks into database")
 
-        # Create embeddings for new chunks only
+        # Create and insert embeddings for new chunks only
         log.info("Creating embeddings for new chunks...")
         new_chunk_texts = [chunk.content for chunk in new_chunks]
-        new_embeddings = embedding_service.create_embeddings_batch(new_chunk_texts)
-
-        if new_embeddings is None or len(new_embeddings) == 0:
-            log.error("Failed to create embeddings")
-            return
-
-        # Insert new embeddings into database
-        log.info("Inserting new embeddings into database...")
-        db_service.insert_embeddings(chunk_ids, new_embeddings)
-
-        # Rebuild FAISS index with all data
-        rebuild_faiss_index(db_service, embedding_service, faiss_service)
+        disk_cache = EmbeddingDiskCache(model_name=embedding_service.model_name)
+        embeddings = embed_and_store(
+            embedding_service, db_service, chunk_ids, new_chunk_texts, disk_cache
+        )
 
-        # Rebuild BM25 index
-        rebuild_bm25_index()
+        # Add the new vectors to the FAISS index and rebuild BM25 with all
+        # chunks; they touch separate files, so both run at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(
+                    update_faiss_index,
+                    faiss_service,
+                    db_service,
+                    chunk_ids,
+                    embeddings,
+                ),
+                executor.submit(rebuild_bm25_index, db_service),
+            ]
+        for future in futures:
+            future.result()
 
         # Final statistics
-        total_chunks = len(existing_chunks) + len(new_chunks_for_json)
+        total_chunks = existing_count + len(new_chunks_for_json)
         log.info("Incremental processing completed successfully!")
-        log.info(f"Previous chunks: {len(existing_chunks)}")
+        log.info(f"Previous chunks: {existing_count}")
         log.info(f"New chunks added: {len(new_chunks_for_json)}")
         log.info(f"Total chunks: {total_chunks}")
 
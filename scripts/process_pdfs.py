@@ -10,8 +10,9 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
-from src.services.pdf_processor import PDFProcessor
+from src.services.pdf_processor import CHUNKS_FILENAME, PDFProcessor
 from src.utils.logger import log
+from config.settings import ensure_dirs
 
 
 def main():
@@ -42,6 +43,7 @@ def main():
     use_gemini = args.use_gemini and not args.no_gemini
 
     log.info("Starting enhanced PDF processing with Gemini integration...")
+    ensure_dirs()
     log.info(f"Gemini Vision API enabled: {use_gemini}")
 
     try:
@@ -79,23 +81,31 @@ def main():
                 source_stats[source] = 0
             source_stats[source] += 1
 
-        log.info("Chunks by source file:")
-        for source, count in source_stats.items():
-            log.info(f"  {source}: {count} chunks")
+        # Build the report in memory and emit it as one log record instead of
+        # a separate formatted, flushed write per line
+        out = ["Chunks by source file:"]
+        out.extend(
+            f"  {source}: {count} chunks" for source, count in source_stats.items()
+        )
 
         # Show sample chunks
-        log.info("\nSample chunks:")
+        out.append("\nSample chunks:")
         for i, chunk in enumerate(chunks[:3]):
-            log.info(f"Chunk {i+1}:")
-            log.info(f"  Source: {chunk.source_file}")
-            log.info(f"  Page: {chunk.page_number}")
-            log.info(f"  Heading: {chunk.heading_text or 'N/A'}")
-            log.info(f"  Word count: {chunk.word_count}")
-            log.info(f"  Content preview: {chunk.content[:150]}...")
-            log.info("---")
+            out.extend(
+                (
+                    f"Chunk {i+1}:",
+                    f"  Source: {chunk.source_file}",
+                    f"  Page: {chunk.page_number}",
+                    f"  Heading: {chunk.heading_text or 'N/A'}",
+                    f"  Word count: {chunk.word_count}",
+                    f"  Content preview: {chunk.content[:150]}...",
+                    "---",
+                )
+            )
+        log.info("\n".join(out))
 
         log.info(
-            f"\nProcessed chunks saved to: {processor.processed_dir / 'heading_chunks.json'}"
+            f"\nProcessed chunks saved to: {processor.processed_dir / CHUNKS_FILENAME}"
         )
         log.info(
             "Ready for embedding generation! Run: python scripts/build_embeddings.py"
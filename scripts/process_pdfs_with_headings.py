@@ -1,7 +1,7 @@
 """
 Script to process PDFs using heading-based chunking
 """
-import json
+import dataclasses
 import sys
 from pathlib import Path
 
@@ -10,15 +10,22 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from src.utils.logger import log
-from src.services.pdf_processor import PDFProcessor
+from src.services.pdf_processor import (
+    CHUNKS_FILENAME,
+    PDFProcessor,
+    write_chunk_records,
+)
 from src.services.embedding_service import EmbeddingService
+from src.services.embedding_disk_cache import EmbeddingDiskCache
 from src.services.database_service import DatabaseService
 from src.services.faiss_service import FAISSService
-from config.settings import PDF_DIR, PROCESSED_DIR
+from config.settings import PDF_DIR, PROCESSED_DIR, ensure_dirs
+from scripts._build_common import embed_and_store
 
 def main():
     """Process PDFs and create heading-based chunks"""
     log.info("Starting PDF processing with heading-based chunking...")
+    ensure_dirs()
     
     try:
         # Initialize services
@@ -36,20 +43,8 @@ def main():
         
         log.info(f"Found {len(pdf_files)} PDF files")
         
-        # Process each PDF file
-        all_chunks = []
-        
-        for pdf_file in pdf_files:
-            log.info(f"Processing {pdf_file.name}...")
-            
-            # Process PDF with heading-based chunking
-            chunks = pdf_processor.process_pdf_with_headings(pdf_file)
-            
-            if not chunks:
-                log.warning(f"No chunks created from {pdf_file.name}")
-                continue
-            
-            all_chunks.extend(chunks)
+        # Process the PDF files with heading-based chunking in worker processes
+        all_chunks = pdf_processor.process_pdfs_parallel(pdf_files)
         
         if not all_chunks:
             log.error("No chunks created from any PDF files")
@@ -58,23 +53,21 @@ def main():
         log.info(f"Created a total of {len(all_chunks)} chunks")
         
         # Save chunks to file
-        output_file = PROCESSED_DIR / "heading_chunks.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump([chunk.dict() for chunk in all_chunks], f, ensure_ascii=False, indent=2)
+        output_file = PROCESSED_DIR / CHUNKS_FILENAME
+        write_chunk_records(output_file, (dataclasses.asdict(chunk) for chunk in all_chunks))
         
         log.info(f"Saved chunks to {output_file}")
         
         # Insert chunks into database
         chunk_ids = db_service.insert_chunks(all_chunks)
         
-        # Create embeddings
+        # Create embeddings and insert them into database
         log.info("Creating embeddings...")
         texts = [chunk.content for chunk in all_chunks]
-        embeddings = embedding_service.create_embeddings_batch(texts, batch_size=16)
-        
-        # Insert embeddings into database
-        log.info("Inserting embeddings into database...")
-        db_service.insert_embeddings(chunk_ids, embeddings)
+        disk_cache = EmbeddingDiskCache(model_name=embedding_service.model_name)
+        embeddings = embed_and_store(
+            embedding_service, db_service, chunk_ids, texts, disk_cache
+        )
         
         # Create FAISS index
         log.info("Creating FAISS index...")
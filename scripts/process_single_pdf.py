@@ -11,8 +11,11 @@ sys.path.append(str(project_root))
 from src.services.pdf_processor import PDFProcessor
 from src.services.database_service import DatabaseService
 from src.services.embedding_service import EmbeddingService
+from src.services.embedding_disk_cache import EmbeddingDiskCache
 from src.services.faiss_service import FAISSService
 from src.utils.logger import log
+from config.settings import ensure_dirs
+from scripts._build_common import embed_and_store, update_faiss_index
 
 
 def main():
@@ -23,6 +26,7 @@ def main():
     
     pdf_filename = sys.argv[1]
     log.info(f"Processing single PDF: {pdf_filename}")
+    ensure_dirs()
     
     # Initialize services
     pdf_processor = PDFProcessor()
@@ -36,8 +40,8 @@ def main():
         log.error(f"PDF file not found: {pdf_path}")
         return
     
-    # Process PDF to chunks
-    chunks = pdf_processor.process_pdf_to_chunks(pdf_path)
+    # Process PDF with heading-based chunking
+    chunks = pdf_processor.process_pdf_with_headings(pdf_path)
     
     if not chunks:
         log.warning(f"No chunks created from {pdf_filename}")
@@ -48,21 +52,15 @@ def main():
     # Insert chunks into database
     chunk_ids = db_service.insert_chunks(chunks)
     
-    # Create embeddings
+    # Create embeddings and insert them into database
     texts = [chunk.content for chunk in chunks]
-    embeddings = embedding_service.create_embeddings_batch(texts)
+    disk_cache = EmbeddingDiskCache(model_name=embedding_service.model_name)
+    embeddings = embed_and_store(
+        embedding_service, db_service, chunk_ids, texts, disk_cache
+    )
     
-    # Insert embeddings into database
-    db_service.insert_embeddings(chunk_ids, embeddings)
-    
-    # Load existing FAISS index
-    faiss_service.load_index()
-    
-    # Add new embeddings to index
-    faiss_service.add_to_index(embeddings, chunk_ids)
-    
-    # Save updated index
-    faiss_service.save_index()
+    # Add new embeddings to the existing FAISS index and save it
+    update_faiss_index(faiss_service, db_service, chunk_ids, embeddings)
     
     log.info(f"Successfully processed {pdf_filename} and added {len(chunks)} chunks to the system")
 
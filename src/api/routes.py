@@ -13,7 +13,9 @@ from fastapi import (
     Query,
     Request,
 )
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+import asyncio
+import orjson
 import time
 import datetime
 from pathlib import Path
@@ -54,6 +56,7 @@ from src.utils.logger import log
 router = APIRouter()
 
 # Global service instances
+db_service = None
 rag_service = None
 feedback_service = None
 analytics_service = None
@@ -67,11 +70,19 @@ _suggested_questions_cache = {
 }
 
 
+def get_db_service() -> PostgresDatabaseService:
+    """Dependency to get the shared PostgreSQL service (one connection pool per process)"""
+    global db_service
+    if db_service is None:
+        db_service = PostgresDatabaseService()
+    return db_service
+
+
 def get_rag_service() -> RAGService:
     """Dependency to get RAG service instance"""
     global rag_service
     if rag_service is None:
-        rag_service = RAGService()
+        rag_service = RAGService(db_service=get_db_service())
     return rag_service
 
 
@@ -79,7 +90,7 @@ def get_feedback_service() -> FeedbackService:
     """Dependency to get Feedback service instance"""
     global feedback_service
     if feedback_service is None:
-        feedback_service = FeedbackService()
+        feedback_service = FeedbackService(get_db_service())
     return feedback_service
 
 
@@ -87,7 +98,7 @@ def get_analytics_service() -> AnalyticsService:
     """Dependency to get Analytics service instance"""
     global analytics_service
     if analytics_service is None:
-        analytics_service = AnalyticsService()
+        analytics_service = AnalyticsService(get_db_service())
     return analytics_service
 
 
@@ -95,8 +106,7 @@ def get_attachment_service() -> AttachmentService:
     """Dependency to get Attachment service instance"""
     global attachment_service
     if attachment_service is None:
-        db_service = PostgresDatabaseService()
-        attachment_service = AttachmentService(db_service)
+        attachment_service = AttachmentService(get_db_service())
     return attachment_service
 
 
@@ -244,8 +254,8 @@ async def health_endpoint(rag: RAGService = Depends(get_rag_service)):
     Health check endpoint
     """
     try:
-        # Check system health
-        health = rag.check_system_health()
+        # Check system health off the event loop; the probes block on I/O
+        health = await asyncio.to_thread(rag.check_system_health)
 
         # Determine component statuses
         ollama_status = health["components"].get("ollama", {}).get("status", "unknown")
@@ -896,7 +906,7 @@ async def admin_upload_document(
             # Generate embeddings
             log.info(f"🧠 Generating embeddings for {len(chunks)} chunks...")
             embeddings = rag.embedding_service.create_embeddings_batch(
-                [chunk.content for chunk in chunks], batch_size=16, show_progress=False
+                [chunk.content for chunk in chunks], show_progress=False
             )
 
             # Insert embeddings into database (Supabase PostgreSQL)
@@ -1139,20 +1149,50 @@ async def export_chat_history(
     """
     Export chat history as JSON
 
+    The document is streamed conversation by conversation, so the full
+    history is never held in memory. If reading fails mid-stream the
+    document is still closed, with an "error" field saying it is incomplete.
+
     Args:
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
     """
     try:
-        conversations = rag.db_service.export_conversations(start_date, end_date)
+        # Count and stream the same snapshot: messages written after the
+        # export starts are left out of both
+        export_date = datetime.datetime.now()
+        total = rag.db_service.count_conversations(start_date, end_date, export_date)
+        conversations = rag.db_service.iter_conversations(
+            start_date, end_date, export_date
+        )
+        # Run the query before the response starts, so failures still map
+        # to a 500 instead of a truncated 200 body
+        first = next(conversations, None)
+        header = orjson.dumps(
+            {
+                "export_date": export_date.isoformat(),
+                "start_date": start_date,
+                "end_date": end_date,
+                "total_conversations": total,
+            }
+        )
 
-        return {
-            "export_date": datetime.datetime.now().isoformat(),
-            "start_date": start_date,
-            "end_date": end_date,
-            "total_conversations": len(conversations),
-            "conversations": conversations,
-        }
+        def stream_export():
+            yield header[:-1] + b',"conversations":['
+            try:
+                if first is not None:
+                    yield orjson.dumps(first)
+                    for conversation in conversations:
+                        yield b"," + orjson.dumps(conversation)
+            except Exception as e:
+                # The 200 status is already sent; end the document with the
+                # error rather than leave clients a truncated body
+                log.error(f"Error exporting chat history: {e}")
+                yield b"]," + orjson.dumps({"error": str(e)})[1:]
+                return
+            yield b"]}"
+
+        return StreamingResponse(stream_export(), media_type="application/json")
 
     except Exception as e:
         log.error(f"Error exporting chat history: {e}")
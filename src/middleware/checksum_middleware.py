@@ -6,7 +6,7 @@ from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 import hashlib
-import os
+from config.settings import ENABLE_CHECKSUM_VERIFICATION
 
 
 class ChecksumMiddleware(BaseHTTPMiddleware):
@@ -17,9 +17,7 @@ class ChecksumMiddleware(BaseHTTPMiddleware):
 
     def __init__(self, app: ASGIApp):
         super().__init__(app)
-        self.enable_checksum = (
-            os.getenv("ENABLE_CHECKSUM_VERIFICATION", "false").lower() == "true"
-        )
+        self.enable_checksum = ENABLE_CHECKSUM_VERIFICATION
         self.checksum_required_paths = [
             "/api/admin/upload",
             "/api/documents/upload",
@@ -6,7 +6,7 @@ from fastapi import Request, Response
 from fastapi.responses import RedirectResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
-import os
+from config.settings import HTTPS_ONLY
 
 
 class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
@@ -16,7 +16,7 @@ class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
 
     def __init__(self, app: ASGIApp):
         super().__init__(app)
-        self.enforce_https = os.getenv("HTTPS_ONLY", "false").lower() == "true"
+        self.enforce_https = HTTPS_ONLY
 
     async def dispatch(self, request: Request, call_next):
         """Redirect HTTP to HTTPS if enabled"""
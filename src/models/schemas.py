@@ -4,6 +4,7 @@ Pydantic models for request/response schemas
 
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 
 
 class ImageInput(BaseModel):
@@ -119,8 +120,15 @@ class HealthResponse(BaseModel):
     database_status: str = Field(..., description="Database status")
 
 
-class DocumentChunk(BaseModel):
-    """Model for document chunks"""
+@dataclass(slots=True, kw_only=True)
+class DocumentChunk:
+    """
+    Model for document chunks
+
+    A slotted pydantic dataclass rather than a BaseModel: chunk lists are
+    large, and slots drop the per-instance __dict__ while keeping validation.
+    Use dataclasses.asdict() to serialise.
+    """
 
     id: Optional[int] = Field(None, description="Chunk ID")
     content: str = Field(..., description="Chunk content")
@@ -158,6 +166,14 @@ class DocumentChunk(BaseModel):
         None, description="Number of characters in the chunk"
     )
 
+    def __post_init__(self):
+        # Fill counts missing from older chunk files once, at load, so
+        # consumers can always read them directly
+        if self.char_count is None:
+            self.char_count = len(self.content)
+        if self.word_count is None:
+            self.word_count = len(self.content.split())
+
 
 class EmbeddingData(BaseModel):
     """Model for embedding data"""
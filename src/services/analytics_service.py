@@ -2,9 +2,11 @@
 Analytics Service for dashboard insights and metrics
 """
 
+import re
 from datetime import datetime, timedelta
 from typing import List
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 from src.services.postgres_database_service import PostgresDatabaseService
 from src.models.analytics import (
     TimeRange,
@@ -33,6 +35,17 @@ from src.models.analytics import (
 )
 from src.utils.logger import log
 
+# Filename keywords per document category, checked in order; one compiled
+# alternation per category instead of lowercasing and scanning per keyword
+_CATEGORY_PATTERNS = [
+    (re.compile(r"tuyen|tuyển|xet_tuyen", re.IGNORECASE), "Tuyển sinh"),
+    (re.compile(r"dao_tao|đào tạo|chuong_trinh", re.IGNORECASE), "Đào tạo"),
+    (re.compile(r"hoc_phi|học phí|tai_chinh", re.IGNORECASE), "Tài chính"),
+    (re.compile(r"quy_che|quy_dinh|noi_quy", re.IGNORECASE), "Quy chế"),
+    (re.compile(r"thong_bao|thông báo", re.IGNORECASE), "Thông báo"),
+    (re.compile(r"ktx|ky_tuc|ký túc", re.IGNORECASE), "Ký túc xá"),
+]
+
 
 class AnalyticsService:
     """Service for analytics and dashboard insights"""
@@ -50,188 +63,118 @@ class AnalyticsService:
     def _init_analytics_tables(self):
         """Create analytics-related tables if they don't exist"""
         try:
-            with self.db_service.engine.connect() as conn:
-                # Create token_usage table
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS token_usage (
-                        id SERIAL PRIMARY KEY,
-                        session_id VARCHAR(255),
-                        conversation_id VARCHAR(255),
-                        input_tokens INTEGER DEFAULT 0,
-                        output_tokens INTEGER DEFAULT 0,
-                        total_tokens INTEGER DEFAULT 0,
-                        model_name VARCHAR(100),
-                        estimated_cost FLOAT DEFAULT 0.0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
-
-                # Create access_logs table
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS access_logs (
-                        id SERIAL PRIMARY KEY,
-                        session_id VARCHAR(255),
-                        ip_address VARCHAR(50),
-                        user_agent TEXT,
-                        endpoint VARCHAR(255),
-                        method VARCHAR(10),
-                        status_code INTEGER,
-                        is_blocked BOOLEAN DEFAULT FALSE,
-                        block_reason VARCHAR(255),
-                        response_time_ms FLOAT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
-
-                # Create user_sessions table with enhanced tracking
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS user_sessions (
-                        id SERIAL PRIMARY KEY,
-                        session_id VARCHAR(255) UNIQUE NOT NULL,
-                        ip_address VARCHAR(50),
-                        user_agent TEXT,
-                        first_visit TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        last_visit TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        total_visits INTEGER DEFAULT 1,
-                        total_questions INTEGER DEFAULT 0,
-                        total_conversations INTEGER DEFAULT 0,
-                        total_likes INTEGER DEFAULT 0,
-                        total_dislikes INTEGER DEFAULT 0,
-                        is_new_user BOOLEAN DEFAULT TRUE,
-                        user_segment VARCHAR(50) DEFAULT 'new',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
-
-                # Create topic_classifications table for query topic tracking
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS topic_classifications (
-                        id SERIAL PRIMARY KEY,
-                        conversation_id VARCHAR(255),
-                        session_id VARCHAR(255),
-                        query TEXT NOT NULL,
-                        topic VARCHAR(100) NOT NULL,
-                        confidence FLOAT DEFAULT 0.0,
-                        keywords TEXT[],
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
-
-                # Create unanswered_queries table for tracking failed responses
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS unanswered_queries (
-                        id SERIAL PRIMARY KEY,
-                        conversation_id VARCHAR(255),
-                        session_id VARCHAR(255),
-                        query TEXT NOT NULL,
-                        response TEXT,
-                        reason VARCHAR(100),
-                        confidence FLOAT DEFAULT 0.0,
-                        retrieval_count INTEGER DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
-
-                # Create document_history table for tracking document changes
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS document_history (
-                        id SERIAL PRIMARY KEY,
-                        document_name VARCHAR(500) NOT NULL,
-                        action VARCHAR(50) NOT NULL,
-                        file_size INTEGER DEFAULT 0,
-                        chunk_count INTEGER DEFAULT 0,
-                        category VARCHAR(100),
-                        previous_version VARCHAR(500),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
-
-                # Create query_document_coverage table for content gap analysis
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS query_document_coverage (
-                        id SERIAL PRIMARY KEY,
-                        query TEXT NOT NULL,
-                        topic VARCHAR(100),
-                        matched_documents TEXT[],
-                        coverage_score FLOAT DEFAULT 0.0,
-                        relevance_scores FLOAT[],
-                        has_good_answer BOOLEAN DEFAULT TRUE,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
+            # All schema statements go out as one script in a single round trip
+            schema_sql = """
+                -- Create token_usage table
+                CREATE TABLE IF NOT EXISTS token_usage (
+                    id SERIAL PRIMARY KEY,
+                    session_id TEXT,
+                    conversation_id TEXT,
+                    input_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    total_tokens INTEGER DEFAULT 0,
+                    model_name TEXT,
+                    estimated_cost FLOAT DEFAULT 0.0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create access_logs table
+                CREATE TABLE IF NOT EXISTS access_logs (
+                    id SERIAL PRIMARY KEY,
+                    session_id TEXT,
+                    ip_address TEXT,
+                    user_agent TEXT,
+                    endpoint TEXT,
+                    method TEXT,
+                    status_code INTEGER,
+                    is_blocked BOOLEAN DEFAULT FALSE,
+                    block_reason TEXT,
+                    response_time_ms FLOAT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create user_sessions table with enhanced tracking
+                CREATE TABLE IF NOT EXISTS user_sessions (
+                    id SERIAL PRIMARY KEY,
+                    session_id TEXT UNIQUE NOT NULL,
+                    ip_address TEXT,
+                    user_agent TEXT,
+                    first_visit TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_visit TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    total_visits INTEGER DEFAULT 1,
+                    total_questions INTEGER DEFAULT 0,
+                    total_conversations INTEGER DEFAULT 0,
+                    total_likes INTEGER DEFAULT 0,
+                    total_dislikes INTEGER DEFAULT 0,
+                    is_new_user BOOLEAN DEFAULT TRUE,
+                    user_segment TEXT DEFAULT 'new',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create topic_classifications table for query topic tracking
+                CREATE TABLE IF NOT EXISTS topic_classifications (
+                    id SERIAL PRIMARY KEY,
+                    conversation_id TEXT,
+                    session_id TEXT,
+                    query TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    confidence FLOAT DEFAULT 0.0,
+                    keywords TEXT[],
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create unanswered_queries table for tracking failed responses
+                CREATE TABLE IF NOT EXISTS unanswered_queries (
+                    id SERIAL PRIMARY KEY,
+                    conversation_id TEXT,
+                    session_id TEXT,
+                    query TEXT NOT NULL,
+                    response TEXT,
+                    reason TEXT,
+                    confidence FLOAT DEFAULT 0.0,
+                    retrieval_count INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create document_history table for tracking document changes
+                CREATE TABLE IF NOT EXISTS document_history (
+                    id SERIAL PRIMARY KEY,
+                    document_name TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    file_size INTEGER DEFAULT 0,
+                    chunk_count INTEGER DEFAULT 0,
+                    category TEXT,
+                    previous_version TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create query_document_coverage table for content gap analysis
+                CREATE TABLE IF NOT EXISTS query_document_coverage (
+                    id SERIAL PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    topic TEXT,
+                    matched_documents TEXT[],
+                    coverage_score FLOAT DEFAULT 0.0,
+                    relevance_scores FLOAT[],
+                    has_good_answer BOOLEAN DEFAULT TRUE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create indexes
+                CREATE INDEX IF NOT EXISTS idx_token_usage_created ON token_usage(created_at);
+                CREATE INDEX IF NOT EXISTS idx_access_logs_created ON access_logs(created_at);
+                CREATE INDEX IF NOT EXISTS idx_user_sessions_session ON user_sessions(session_id);
+                CREATE INDEX IF NOT EXISTS idx_topic_class_topic ON topic_classifications(topic);
+                CREATE INDEX IF NOT EXISTS idx_topic_class_created ON topic_classifications(created_at);
+                CREATE INDEX IF NOT EXISTS idx_unanswered_created ON unanswered_queries(created_at);
+                CREATE INDEX IF NOT EXISTS idx_doc_history_created ON document_history(created_at);
+                CREATE INDEX IF NOT EXISTS idx_query_coverage_topic ON query_document_coverage(topic);
+            """
 
-                # Create indexes
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_token_usage_created ON token_usage(created_at)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_access_logs_created ON access_logs(created_at)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_user_sessions_session ON user_sessions(session_id)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_topic_class_topic ON topic_classifications(topic)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_topic_class_created ON topic_classifications(created_at)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_unanswered_created ON unanswered_queries(created_at)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_doc_history_created ON document_history(created_at)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_query_coverage_topic ON query_document_coverage(topic)"
-                    )
-                )
+            with self.db_service.engine.begin() as conn:
+                conn.execute(text(schema_sql))
 
-                conn.commit()
-                log.info("✅ Analytics tables initialized successfully")
+            log.info("✅ Analytics tables initialized successfully")
 
         except Exception as e:
             log.error(f"❌ Error initializing analytics tables: {e}")
@@ -1136,10 +1079,13 @@ class AnalyticsService:
             # Generate sample data if needed
             if not category_stats:
                 category_stats = self._generate_sample_category_stats()
-                total_docs = sum(c.document_count for c in category_stats)
-                total_size = sum(c.total_size_bytes for c in category_stats)
-                active_docs = sum(c.active_count for c in category_stats)
-                inactive_docs = sum(c.inactive_count for c in category_stats)
+                # Accumulate all four totals in a single pass
+                total_docs = total_size = active_docs = inactive_docs = 0
+                for c in category_stats:
+                    total_docs += c.document_count
+                    total_size += c.total_size_bytes
+                    active_docs += c.active_count
+                    inactive_docs += c.inactive_count
 
             if not top_documents:
                 top_documents = self._generate_sample_top_documents()
@@ -1431,89 +1377,59 @@ class AnalyticsService:
         try:
             session = self.db_service.SessionLocal()
             today = datetime.now().date()
-            yesterday = today - timedelta(days=1)
             last_week = today - timedelta(days=7)
 
-            # Total conversations
-            conv_result = session.execute(
-                text("SELECT COUNT(DISTINCT conversation_id) FROM conversations")
-            )
-            total_conversations = conv_result.scalar() or 0
-
-            # Today's conversations
-            today_conv_result = session.execute(
-                text(
-                    "SELECT COUNT(DISTINCT conversation_id) FROM conversations WHERE DATE(created_at) = :today"
-                ),
-                {"today": today},
-            )
-            today_conversations = today_conv_result.scalar() or 0
-
-            # Last week's conversations for comparison
-            last_week_result = session.execute(
+            # Every count in one round trip and one scan of conversations; the
+            # day bounds are half-open timestamp ranges so indexes stay usable.
+            # Users are estimated by distinct conversations, as before
+            (
+                total_conversations,
+                today_conversations,
+                last_week_conversations,
+                total_messages,
+                today_messages,
+                avg_response_time,
+                total_documents,
+                satisfaction_rate,
+            ) = session.execute(
                 text(
                     """
-                SELECT COUNT(DISTINCT conversation_id) FROM conversations 
-                WHERE DATE(created_at) BETWEEN :start AND :end
+                SELECT
+                    COUNT(DISTINCT conversation_id),
+                    COUNT(DISTINCT conversation_id)
+                        FILTER (WHERE created_at >= :today AND created_at < :tomorrow),
+                    COUNT(DISTINCT conversation_id)
+                        FILTER (WHERE created_at >= :last_week AND created_at < :today),
+                    COUNT(*),
+                    COUNT(*)
+                        FILTER (WHERE created_at >= :today AND created_at < :tomorrow),
+                    AVG(processing_time),
+                    (SELECT COUNT(DISTINCT source_file) FROM chunks),
+                    (
+                        SELECT COUNT(*) FILTER (WHERE rating = 'positive') * 100.0
+                            / NULLIF(COUNT(*), 0)
+                        FROM feedback
+                    )
+                FROM conversations
             """
                 ),
-                {"start": last_week, "end": yesterday},
-            )
-            last_week_conversations = last_week_result.scalar() or 1
-
-            # Total messages
-            msg_result = session.execute(text("SELECT COUNT(*) FROM conversations"))
-            total_messages = msg_result.scalar() or 0
-
-            # Today's messages
-            today_msg_result = session.execute(
-                text(
-                    "SELECT COUNT(*) FROM conversations WHERE DATE(created_at) = :today"
-                ),
-                {"today": today},
-            )
-            today_messages = today_msg_result.scalar() or 0
-
-            # Total documents
-            doc_result = session.execute(
-                text("SELECT COUNT(DISTINCT source_file) FROM chunks")
-            )
-            total_documents = doc_result.scalar() or 0
-
-            # Unique users (sessions)
-            user_result = session.execute(
-                text("SELECT COUNT(DISTINCT conversation_id) FROM conversations")
-            )
-            total_users = user_result.scalar() or 0
-
-            # Today's new users estimate
-            today_users_result = session.execute(
-                text(
-                    "SELECT COUNT(DISTINCT conversation_id) FROM conversations WHERE DATE(created_at) = :today"
-                ),
-                {"today": today},
-            )
-            today_new_users = today_users_result.scalar() or 0
-
-            # Average response time
-            time_result = session.execute(
-                text(
-                    "SELECT AVG(processing_time) FROM conversations WHERE processing_time IS NOT NULL"
-                )
-            )
-            avg_response_time = time_result.scalar() or 1.2
-
-            # Satisfaction rate from feedback
-            satisfaction_result = session.execute(
-                text(
-                    """
-                SELECT 
-                    COUNT(CASE WHEN rating = 'positive' THEN 1 END) * 100.0 / NULLIF(COUNT(*), 0)
-                FROM feedback
-            """
-                )
-            )
-            satisfaction_rate = satisfaction_result.scalar() or 75.0
+                {
+                    "today": today,
+                    "tomorrow": today + timedelta(days=1),
+                    "last_week": last_week,
+                },
+            ).one()
+
+            total_conversations = total_conversations or 0
+            today_conversations = today_conversations or 0
+            last_week_conversations = last_week_conversations or 1
+            total_messages = total_messages or 0
+            today_messages = today_messages or 0
+            avg_response_time = avg_response_time or 1.2
+            total_documents = total_documents or 0
+            satisfaction_rate = satisfaction_rate or 75.0
+            total_users = total_conversations
+            today_new_users = today_conversations
 
             session.close()
 
@@ -1586,10 +1502,11 @@ class AnalyticsService:
         input_tokens: int,
         output_tokens: int,
         model_name: str = "gemini-pro",
+        db_session: Session = None,
     ):
         """Log token usage for a request"""
         try:
-            session = self.db_service.SessionLocal()
+            session = db_session or self.db_service.SessionLocal()
 
             # Calculate estimated cost (example rates)
             # Gemini Pro: $0.00025 per 1K input tokens, $0.0005 per 1K output tokens
@@ -1612,12 +1529,17 @@ class AnalyticsService:
                     "cost": estimated_cost,
                 },
             )
-            session.commit()
+            if db_session is None:
+                session.commit()
 
         except Exception as e:
             log.error(f"❌ Error logging token usage: {e}")
+            # A caller-owned transaction must see the failure to roll back
+            if db_session is not None:
+                raise
         finally:
-            session.close()
+            if db_session is None:
+                session.close()
 
     def log_access(
         self,
@@ -1670,74 +1592,57 @@ class AnalyticsService:
         user_agent: str = None,
         increment_questions: bool = False,
         increment_conversations: bool = False,
+        db_session: Session = None,
     ):
         """Track or update user session"""
         try:
-            session = self.db_service.SessionLocal()
+            session = db_session or self.db_service.SessionLocal()
 
-            # Check if session exists
-            result = session.execute(
+            # Create or update the session in one round trip. On update, a user
+            # stops being new once their first visit is more than 7 whole days
+            # old, and the segment follows the running question count
+            session.execute(
                 text(
-                    "SELECT id, total_visits, total_questions, total_conversations, first_visit FROM user_sessions WHERE session_id = :sid"
-                ),
-                {"sid": session_id},
-            )
-            existing = result.fetchone()
-
-            if existing:
-                # Update existing session
-                updates = [
-                    "last_visit = CURRENT_TIMESTAMP",
-                    "total_visits = total_visits + 1",
-                ]
-                if increment_questions:
-                    updates.append("total_questions = total_questions + 1")
-                if increment_conversations:
-                    updates.append("total_conversations = total_conversations + 1")
-
-                # Check if user is still new (visited within last 7 days for first time)
-                first_visit = existing[4]
-                if first_visit and (datetime.now() - first_visit).days > 7:
-                    updates.append("is_new_user = FALSE")
-
-                # Update segment based on activity
-                total_questions = existing[2] + (1 if increment_questions else 0)
-                if total_questions >= 50:
-                    updates.append("user_segment = 'power_user'")
-                elif total_questions >= 20:
-                    updates.append("user_segment = 'regular'")
-                elif total_questions >= 5:
-                    updates.append("user_segment = 'casual'")
-
-                session.execute(
-                    text(
-                        f"UPDATE user_sessions SET {', '.join(updates)} WHERE session_id = :sid"
-                    ),
-                    {"sid": session_id},
-                )
-            else:
-                # Create new session
-                session.execute(
-                    text(
-                        """
-                        INSERT INTO user_sessions (session_id, ip_address, user_agent, total_questions, total_conversations)
-                        VALUES (:sid, :ip, :ua, :questions, :convs)
                     """
-                    ),
-                    {
-                        "sid": session_id,
-                        "ip": ip_address,
-                        "ua": user_agent[:500] if user_agent else None,
-                        "questions": 1 if increment_questions else 0,
-                        "convs": 1 if increment_conversations else 0,
-                    },
-                )
+                    INSERT INTO user_sessions (session_id, ip_address, user_agent, total_questions, total_conversations)
+                    VALUES (:sid, :ip, :ua, :questions, :convs)
+                    ON CONFLICT (session_id) DO UPDATE SET
+                        last_visit = CURRENT_TIMESTAMP,
+                        total_visits = user_sessions.total_visits + 1,
+                        total_questions = user_sessions.total_questions + EXCLUDED.total_questions,
+                        total_conversations = user_sessions.total_conversations + EXCLUDED.total_conversations,
+                        is_new_user = CASE
+                            WHEN LOCALTIMESTAMP - user_sessions.first_visit >= INTERVAL '8 days'
+                            THEN FALSE
+                            ELSE user_sessions.is_new_user
+                        END,
+                        user_segment = CASE
+                            WHEN user_sessions.total_questions + EXCLUDED.total_questions >= 50 THEN 'power_user'
+                            WHEN user_sessions.total_questions + EXCLUDED.total_questions >= 20 THEN 'regular'
+                            WHEN user_sessions.total_questions + EXCLUDED.total_questions >= 5 THEN 'casual'
+                            ELSE user_sessions.user_segment
+                        END
+                """
+                ),
+                {
+                    "sid": session_id,
+                    "ip": ip_address,
+                    "ua": user_agent[:500] if user_agent else None,
+                    "questions": 1 if increment_questions else 0,
+                    "convs": 1 if increment_conversations else 0,
+                },
+            )
 
-            session.commit()
+            if db_session is None:
+                session.commit()
         except Exception as e:
             log.error(f"❌ Error tracking user session: {e}")
+            # A caller-owned transaction must see the failure to roll back
+            if db_session is not None:
+                raise
         finally:
-            session.close()
+            if db_session is None:
+                session.close()
 
     def update_user_feedback(self, session_id: str, is_positive: bool):
         """Update user feedback counts"""
@@ -1873,13 +1778,14 @@ class AnalyticsService:
         topic: str = None,
         confidence: float = None,
         keywords: List[str] = None,
+        db_session: Session = None,
     ):
         """Log topic classification for a query"""
         try:
             if not topic:
                 topic, confidence, keywords = self.classify_topic(query)
 
-            session = self.db_service.SessionLocal()
+            session = db_session or self.db_service.SessionLocal()
             session.execute(
                 text(
                     """
@@ -1896,13 +1802,18 @@ class AnalyticsService:
                     "keywords": keywords if keywords else [],
                 },
             )
-            session.commit()
+            if db_session is None:
+                session.commit()
             return topic, confidence
         except Exception as e:
             log.error(f"❌ Error logging topic classification: {e}")
+            # A caller-owned transaction must see the failure to roll back
+            if db_session is not None:
+                raise
             return "Khác", 0.0
         finally:
-            session.close()
+            if db_session is None:
+                session.close()
 
     # ==================== UNANSWERED QUERY DETECTION ====================
 
@@ -1956,10 +1867,11 @@ class AnalyticsService:
         reason: str,
         confidence: float,
         retrieval_count: int,
+        db_session: Session = None,
     ):
         """Log unanswered query for analysis"""
         try:
-            session = self.db_service.SessionLocal()
+            session = db_session or self.db_service.SessionLocal()
             session.execute(
                 text(
                     """
@@ -1977,11 +1889,16 @@ class AnalyticsService:
                     "count": retrieval_count,
                 },
             )
-            session.commit()
+            if db_session is None:
+                session.commit()
         except Exception as e:
             log.error(f"❌ Error logging unanswered query: {e}")
+            # A caller-owned transaction must see the failure to roll back
+            if db_session is not None:
+                raise
         finally:
-            session.close()
+            if db_session is None:
+                session.close()
 
     # ==================== DOCUMENT HISTORY TRACKING ====================
 
@@ -2026,19 +1943,9 @@ class AnalyticsService:
 
     def _detect_document_category(self, filename: str) -> str:
         """Detect document category from filename"""
-        filename_lower = filename.lower()
-        if any(w in filename_lower for w in ["tuyen", "tuyển", "xet_tuyen"]):
-            return "Tuyển sinh"
-        elif any(w in filename_lower for w in ["dao_tao", "đào tạo", "chuong_trinh"]):
-            return "Đào tạo"
-        elif any(w in filename_lower for w in ["hoc_phi", "học phí", "tai_chinh"]):
-            return "Tài chính"
-        elif any(w in filename_lower for w in ["quy_che", "quy_dinh", "noi_quy"]):
-            return "Quy chế"
-        elif any(w in filename_lower for w in ["thong_bao", "thông báo"]):
-            return "Thông báo"
-        elif any(w in filename_lower for w in ["ktx", "ky_tuc", "ký túc"]):
-            return "Ký túc xá"
+        for pattern, category in _CATEGORY_PATTERNS:
+            if pattern.search(filename):
+                return category
         return "Khác"
 
     # ==================== CONTENT GAP ANALYSIS ====================
@@ -2050,6 +1957,7 @@ class AnalyticsService:
         matched_documents: List[str],
         relevance_scores: List[float],
         has_good_answer: bool,
+        db_session: Session = None,
     ):
         """Log query document coverage for gap analysis"""
         try:
@@ -2059,7 +1967,7 @@ class AnalyticsService:
                 else 0.0
             )
 
-            session = self.db_service.SessionLocal()
+            session = db_session or self.db_service.SessionLocal()
             session.execute(
                 text(
                     """
@@ -2076,11 +1984,16 @@ class AnalyticsService:
                     "good": has_good_answer,
                 },
             )
-            session.commit()
+            if db_session is None:
+                session.commit()
         except Exception as e:
             log.error(f"❌ Error logging query coverage: {e}")
+            # A caller-owned transaction must see the failure to roll back
+            if db_session is not None:
+                raise
         finally:
-            session.close()
+            if db_session is None:
+                session.close()
 
     def get_real_content_gaps(self, limit: int = 10) -> List[ContentGap]:
         """Get real content gaps from query coverage data"""
@@ -2487,9 +2400,17 @@ class AnalyticsService:
         Comprehensive method to track all aspects of a chat interaction.
         Call this after each chat response.
         """
+        db_session = self.db_service.SessionLocal()
         try:
+            # Every row for the interaction is written in one transaction.
+            # Analytics rows can afford to lose the last few commits on a
+            # server crash, so the commit does not wait for the WAL flush
+            db_session.execute(text("SET LOCAL synchronous_commit = off"))
+
             # 1. Track user session
-            self.track_user_session(
+            self._write_in_savepoint(
+                db_session,
+                self.track_user_session,
                 session_id=session_id,
                 ip_address=ip_address,
                 user_agent=user_agent,
@@ -2497,7 +2418,9 @@ class AnalyticsService:
             )
 
             # 2. Log token usage
-            self.log_token_usage(
+            self._write_in_savepoint(
+                db_session,
+                self.log_token_usage,
                 session_id=session_id,
                 conversation_id=conversation_id,
                 input_tokens=input_tokens,
@@ -2506,7 +2429,9 @@ class AnalyticsService:
 
             # 3. Classify and log topic
             topic, topic_confidence, keywords = self.classify_topic(query)
-            self.log_topic_classification(
+            self._write_in_savepoint(
+                db_session,
+                self.log_topic_classification,
                 conversation_id=conversation_id,
                 session_id=session_id,
                 query=query,
@@ -2523,7 +2448,9 @@ class AnalyticsService:
                 retrieval_count=len(retrieved_documents),
             )
             if is_unanswered:
-                self.log_unanswered_query(
+                self._write_in_savepoint(
+                    db_session,
+                    self.log_unanswered_query,
                     conversation_id=conversation_id,
                     session_id=session_id,
                     query=query,
@@ -2535,7 +2462,9 @@ class AnalyticsService:
 
             # 5. Log query coverage for content gap analysis
             has_good_answer = not is_unanswered and confidence >= 0.5
-            self.log_query_coverage(
+            self._write_in_savepoint(
+                db_session,
+                self.log_query_coverage,
                 query=query,
                 topic=topic,
                 matched_documents=retrieved_documents,
@@ -2543,10 +2472,34 @@ class AnalyticsService:
                 has_good_answer=has_good_answer,
             )
 
+            db_session.commit()
             log.info(f"📊 Chat interaction tracked for session {session_id[:8]}...")
 
         except Exception as e:
+            db_session.rollback()
             log.error(f"❌ Error in track_chat_interaction: {e}")
+        finally:
+            db_session.close()
+
+    def _write_in_savepoint(self, db_session: Session, write, **kwargs):
+        """
+        Run one analytics write inside a savepoint of the caller's transaction
+
+        A failed statement aborts the whole Postgres transaction, so without
+        the savepoint one bad row would drop every other row of the
+        interaction. The write logs its own error; only its savepoint is
+        rolled back and the remaining writes go ahead.
+
+        Args:
+            db_session: Session holding the interaction's transaction
+            write: Analytics method accepting a db_session keyword
+            **kwargs: Arguments for the write
+        """
+        try:
+            with db_session.begin_nested():
+                write(db_session=db_session, **kwargs)
+        except Exception:
+            pass
 
     def get_trending_topics(self, hours_lookback: int = 24) -> List[dict]:
         """
@@ -81,24 +81,31 @@ class AttachmentService:
             chunk_ids: List of chunk IDs to link
             relevance_score: Relevance score for the link
         """
+        if not chunk_ids:
+            return
+
         try:
             with self.db.engine.connect() as conn:
-                for chunk_id in chunk_ids:
-                    conn.execute(
-                        text(
-                            """
-                            INSERT INTO chunk_attachments (chunk_id, attachment_id, relevance_score)
-                            VALUES (:chunk_id, :attachment_id, :relevance_score)
-                            ON CONFLICT (chunk_id, attachment_id) DO UPDATE
-                            SET relevance_score = :relevance_score
+                # One executemany; the engine pages it through psycopg2's
+                # batch helpers instead of a round trip per chunk
+                conn.execute(
+                    text(
                         """
-                        ),
+                        INSERT INTO chunk_attachments (chunk_id, attachment_id, relevance_score)
+                        VALUES (:chunk_id, :attachment_id, :relevance_score)
+                        ON CONFLICT (chunk_id, attachment_id) DO UPDATE
+                        SET relevance_score = EXCLUDED.relevance_score
+                    """
+                    ),
+                    [
                         {
                             "chunk_id": chunk_id,
                             "attachment_id": attachment_id,
                             "relevance_score": relevance_score,
-                        },
-                    )
+                        }
+                        for chunk_id in chunk_ids
+                    ],
+                )
                 conn.commit()
                 log.info(
                     f"✅ Linked attachment {attachment_id} to {len(chunk_ids)} chunks"
@@ -5,12 +5,31 @@ Provides caching for embeddings and query results to reduce latency and computat
 
 import redis
 import json
+import orjson
+import numpy as np
 import hashlib
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Union
 from datetime import datetime
 from src.utils.logger import log
 
 
+def _dump_embedding(embedding: Union[List[float], np.ndarray]) -> bytes:
+    """
+    Serialize an embedding as a JSON array
+
+    orjson encodes numpy arrays natively in C, so callers can pass vectors
+    without a .tolist() round trip through Python floats. The output is
+    plain JSON, readable by entries written with the json module before.
+
+    Args:
+        embedding: Embedding vector
+
+    Returns:
+        JSON bytes
+    """
+    return orjson.dumps(embedding, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
 class CacheService:
     """Redis-based caching service for RAG system"""
 
@@ -108,7 +127,7 @@ class CacheService:
 
             if data:
                 log.debug(f"🎯 Cache HIT for embedding: {text[:50]}...")
-                return json.loads(data)
+                return orjson.loads(data)
             else:
                 log.debug(f"❌ Cache MISS for embedding: {text[:50]}...")
                 return None
@@ -118,14 +137,17 @@ class CacheService:
             return None
 
     def set_embedding(
-        self, text: str, embedding: List[float], ttl: Optional[int] = None
+        self,
+        text: str,
+        embedding: Union[List[float], np.ndarray],
+        ttl: Optional[int] = None,
     ) -> bool:
         """
         Store embedding in cache
 
         Args:
             text: Input text
-            embedding: Embedding vector
+            embedding: Embedding vector, as a list or numpy array
             ttl: Time-to-live in seconds (uses default if None)
 
         Returns:
@@ -136,7 +158,7 @@ class CacheService:
 
         try:
             key = f"embedding:{self._make_key(text)}"
-            value = json.dumps(embedding)
+            value = _dump_embedding(embedding)
             cache_ttl = ttl if ttl is not None else self.ttl
 
             self.client.setex(key, cache_ttl, value)
@@ -237,7 +259,7 @@ class CacheService:
 
             for text, data in zip(texts, cached_data):
                 if data:
-                    results[text] = json.loads(data)
+                    results[text] = orjson.loads(data)
                     log.debug(f"🎯 Batch cache HIT: {text[:30]}...")
                 else:
                     results[text] = None
@@ -258,7 +280,8 @@ class CacheService:
         Store multiple embeddings in cache
 
         Args:
-            text_embedding_pairs: List of (text, embedding) tuples
+            text_embedding_pairs: List of (text, embedding) tuples; embeddings
+                may be lists or numpy arrays
             ttl: Time-to-live in seconds (uses default if None)
 
         Returns:
@@ -274,7 +297,7 @@ class CacheService:
 
             for text, embedding in text_embedding_pairs:
                 key = f"embedding:{self._make_key(text)}"
-                value = json.dumps(embedding)
+                value = _dump_embedding(embedding)
                 pipe.setex(key, cache_ttl, value)
                 count += 1
 
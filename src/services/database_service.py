@@ -10,25 +10,54 @@ from src.utils.logger import log
 from src.models.schemas import DocumentChunk
 from config.settings import DATABASE_PATH
 
+# Let SQLite serve reads straight from the OS page cache via mmap
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
 
 class DatabaseService:
     """Service for managing SQLite database operations"""
 
-    def __init__(self, db_path: str = DATABASE_PATH):
+    def __init__(self, db_path: str = DATABASE_PATH, bulk_load: bool = False):
         """
         Initialize database service
 
         Args:
             db_path: Path to SQLite database file
+            bulk_load: Skip fsync on commit, for full rebuilds that can simply
+                be re-run; an application crash still cannot corrupt the file
         """
         self.db_path = Path(db_path)
+        self.bulk_load = bulk_load
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a read-write connection
+
+        Returns:
+            SQLite connection, without fsync on commit in bulk-load mode
+        """
+        conn = sqlite3.connect(self.db_path)
+        if self.bulk_load:
+            conn.execute("PRAGMA synchronous = OFF")
+        return conn
+
+    def _connect_readonly(self) -> sqlite3.Connection:
+        """
+        Open a read-only, memory-mapped connection for query-only methods
+
+        Returns:
+            SQLite connection that cannot write to the database
+        """
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+        return conn
+
     def _init_database(self):
         """Initialize database tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Create chunks table with enhanced metadata
@@ -68,28 +97,44 @@ class DatabaseService:
                 """
                 )
 
-                # Create indexes for better performance
-                cursor.execute(
-                    """
-                    CREATE INDEX IF NOT EXISTS idx_chunks_source
-                    ON chunks (source_file)
-                """
-                )
-
-                cursor.execute(
-                    """
-                    CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_id
-                    ON embeddings (chunk_id)
-                """
-                )
-
                 conn.commit()
-                log.info("Database initialized successfully")
+
+            self.create_indexes()
+            log.info("Database initialized successfully")
 
         except Exception as e:
             log.error(f"Error initializing database: {e}")
             raise
 
+    def create_indexes(self):
+        """Create secondary indexes; a no-op for indexes that already exist"""
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE INDEX IF NOT EXISTS idx_chunks_source
+                ON chunks (source_file);
+
+                CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_id
+                ON embeddings (chunk_id);
+            """
+            )
+
+    def drop_indexes(self):
+        """
+        Drop secondary indexes ahead of a full reload
+
+        Rows then load without per-insert index maintenance, and
+        create_indexes() builds each index once over the finished tables.
+        Any service initialization recreates them if a load is interrupted.
+        """
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                DROP INDEX IF EXISTS idx_chunks_source;
+                DROP INDEX IF EXISTS idx_embeddings_chunk_id;
+            """
+            )
+
     def insert_chunks(self, chunks: List[DocumentChunk]) -> List[int]:
         """
         Insert document chunks into database
@@ -101,21 +146,20 @@ class DatabaseService:
             List of inserted chunk IDs
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
-                chunk_ids = []
-                for chunk in chunks:
-                    cursor.execute(
-                        """
-                        INSERT INTO chunks (
-                            content, source_file, page_number, chunk_index,
-                            heading_text, heading_level, heading_number, parent_heading,
-                            is_sub_chunk, sub_chunk_index, total_sub_chunks, chunk_type,
-                            word_count, char_count
-                        )
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                cursor.executemany(
+                    """
+                    INSERT INTO chunks (
+                        content, source_file, page_number, chunk_index,
+                        heading_text, heading_level, heading_number, parent_heading,
+                        is_sub_chunk, sub_chunk_index, total_sub_chunks, chunk_type,
+                        word_count, char_count
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
                         (
                             chunk.content,
                             chunk.source_file,
@@ -131,10 +175,15 @@ class DatabaseService:
                             chunk.chunk_type,
                             chunk.word_count,
                             chunk.char_count,
-                        ),
-                    )
+                        )
+                        for chunk in chunks
+                    ),
+                )
 
-                    chunk_ids.append(cursor.lastrowid)
+                # The open transaction holds the write lock, so AUTOINCREMENT
+                # hands out consecutive IDs ending at the last inserted row
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                chunk_ids = list(range(last_id - len(chunks) + 1, last_id + 1))
 
                 conn.commit()
                 log.info(f"Inserted {len(chunks)} chunks into database")
@@ -156,21 +205,32 @@ class DatabaseService:
             raise ValueError("Number of chunk IDs must match number of embeddings")
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            # One contiguous float32 block, matching what get_all_embeddings
+            # decodes; each row is then a single bytes copy of its slice
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
 
-                for chunk_id, embedding in zip(chunk_ids, embeddings):
-                    # Convert numpy array to bytes
-                    embedding_bytes = embedding.tobytes()
+            with self._connect() as conn:
+                cursor = conn.cursor()
 
-                    cursor.execute(
-                        """
-                        INSERT INTO embeddings (chunk_id, embedding)
-                        VALUES (?, ?)
-                    """,
-                        (chunk_id, embedding_bytes),
+                # Reject vectors from a different model here rather than when
+                # the index is next rebuilt from the table
+                cursor.execute("SELECT length(embedding) FROM embeddings LIMIT 1")
+                stored = cursor.fetchone()
+                if stored and stored[0] != embeddings.shape[1] * 4:
+                    raise ValueError(
+                        f"Embedding dimension {embeddings.shape[1]} does not "
+                        f"match the stored dimension {stored[0] // 4}; clear "
+                        f"the embeddings before switching models"
                     )
 
+                cursor.executemany(
+                    """
+                    INSERT INTO embeddings (chunk_id, embedding)
+                    VALUES (?, ?)
+                """,
+                    zip(chunk_ids, (embedding.tobytes() for embedding in embeddings)),
+                )
+
                 conn.commit()
                 log.info(f"Inserted {len(embeddings)} embeddings into database")
 
@@ -181,7 +241,7 @@ class DatabaseService:
     def clear_all_data(self):
         """Clear all chunks and embeddings from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Clear embeddings first (due to foreign key constraint)
@@ -200,7 +260,7 @@ class DatabaseService:
     def get_chunk_count(self) -> int:
         """Get the total number of chunks in database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect_readonly() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM chunks")
                 count = cursor.fetchone()[0]
@@ -210,10 +270,22 @@ class DatabaseService:
             log.error(f"Error getting chunk count: {e}")
             return 0
 
+    def get_embedding_chunk_ids(self) -> List[int]:
+        """Get the IDs of all chunks that have a stored embedding"""
+        try:
+            with self._connect_readonly() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT chunk_id FROM embeddings")
+                return [row[0] for row in cursor.fetchall()]
+
+        except Exception as e:
+            log.error(f"Error getting embedding chunk IDs: {e}")
+            raise
+
     def get_processed_files(self) -> List[str]:
         """Get list of file names that are fully processed (all chunks have embeddings)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect_readonly() as conn:
                 cursor = conn.cursor()
                 # Only return files where ALL chunks have corresponding embeddings
                 cursor.execute(
@@ -239,7 +311,7 @@ class DatabaseService:
     def get_chunks_without_embeddings(self) -> List[Dict[str, Any]]:
         """Get chunks that don't have corresponding embeddings"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect_readonly() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -267,7 +339,7 @@ class DatabaseService:
     def delete_chunks_by_file(self, source_file: str) -> bool:
         """Delete all chunks and their embeddings for a specific file"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # First delete embeddings for chunks of this file
@@ -297,7 +369,7 @@ class DatabaseService:
     def get_all_chunks(self) -> List[Dict[str, Any]]:
         """Retrieve all chunks from the database for BM25 corpus."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect_readonly() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 cursor.execute(
@@ -320,7 +392,7 @@ class DatabaseService:
             Tuple of (chunk_ids, embeddings_array)
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect_readonly() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -331,22 +403,34 @@ class DatabaseService:
                 """
                 )
 
-                chunk_ids = []
-                embeddings = []
-
-                for chunk_id, embedding_bytes in cursor.fetchall():
-                    chunk_ids.append(chunk_id)
-
-                    # Convert bytes back to numpy array
-                    embedding = np.frombuffer(embedding_bytes, dtype=np.float32)
-                    embeddings.append(embedding)
+                rows = cursor.fetchall()
+                if not rows:
+                    return [], np.array([])
+
+                chunk_ids, blobs = zip(*rows)
+
+                # Take the row width from the stored data and check every row
+                # against it in one vectorized pass; insert_embeddings keeps
+                # the table to one dimension, so a mismatch means corruption
+                lengths = np.fromiter(map(len, blobs), dtype=np.int64, count=len(blobs))
+                row_bytes = lengths[0]
+                invalid = np.flatnonzero(lengths != row_bytes)
+                if invalid.size:
+                    first = invalid[0]
+                    raise ValueError(
+                        f"{invalid.size} embeddings do not match the stored "
+                        f"dimension {row_bytes // 4}; chunk {chunk_ids[first]} "
+                        f"has {lengths[first] // 4}. Rebuild the embeddings"
+                    )
 
-                if embeddings:
-                    embeddings_array = np.vstack(embeddings)
-                else:
-                    embeddings_array = np.array([])
+                # Decode all vectors with one frombuffer over the joined blobs
+                # instead of one array per row followed by a vstack copy. A
+                # bytearray keeps the result writable for in-place normalization
+                embeddings_array = np.frombuffer(
+                    bytearray().join(blobs), dtype=np.float32
+                ).reshape(len(blobs), row_bytes // 4)
 
-                return chunk_ids, embeddings_array
+                return list(chunk_ids), embeddings_array
 
         except Exception as e:
             log.error(f"Error getting embeddings: {e}")
@@ -363,7 +447,7 @@ class DatabaseService:
             Chunk dictionary or None if not found
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect_readonly() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
 
@@ -389,7 +473,7 @@ class DatabaseService:
     def clear_all_data(self):
         """Clear all data from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute("DELETE FROM embeddings")
@@ -410,20 +494,20 @@ class DatabaseService:
             Dictionary with database stats
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect_readonly() as conn:
                 cursor = conn.cursor()
 
-                # Count chunks
-                cursor.execute("SELECT COUNT(*) FROM chunks")
-                chunk_count = cursor.fetchone()[0]
-
-                # Count embeddings
-                cursor.execute("SELECT COUNT(*) FROM embeddings")
-                embedding_count = cursor.fetchone()[0]
-
-                # Count unique source files
-                cursor.execute("SELECT COUNT(DISTINCT source_file) FROM chunks")
-                file_count = cursor.fetchone()[0]
+                # All three counts from one statement
+                cursor.execute(
+                    """
+                    SELECT
+                        COUNT(*),
+                        COUNT(DISTINCT source_file),
+                        (SELECT COUNT(*) FROM embeddings)
+                    FROM chunks
+                """
+                )
+                chunk_count, file_count, embedding_count = cursor.fetchone()
 
                 return {
                     "total_chunks": chunk_count,
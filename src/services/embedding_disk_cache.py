@@ -0,0 +1,141 @@
+"""
+Persistent on-disk embedding cache keyed by model and content hash
+"""
+
+import hashlib
+import sqlite3
+import numpy as np
+from pathlib import Path
+from typing import Dict, List
+from src.utils.logger import log
+from config.settings import EMBEDDING_CACHE_PATH
+
+
+# Vectors are kept as float16 at rest: half the bytes of float32, and the
+# rounding error (~1e-4 cosine) is far below what changes retrieval ranking
+CACHE_DTYPE = np.float16
+# PRAGMA user_version of the cache file; 1 = float16 table, float32 migrated
+SCHEMA_VERSION = 1
+
+
+class EmbeddingDiskCache:
+    """SQLite-backed cache so rebuilds only encode new or changed chunks"""
+
+    def __init__(self, model_name: str, cache_path: str = EMBEDDING_CACHE_PATH):
+        """
+        Initialize embedding disk cache
+
+        Args:
+            model_name: Embedding model name; part of every key so vectors from
+                another model are never returned
+            cache_path: Path to the SQLite cache file
+        """
+        self.model_name = model_name
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with sqlite3.connect(self.cache_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache_f16 (
+                    key BLOB PRIMARY KEY,
+                    embedding BLOB NOT NULL
+                )
+            """
+            )
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._migrate_float32_entries(conn)
+
+    @staticmethod
+    def _migrate_float32_entries(conn: sqlite3.Connection):
+        """
+        Convert entries of the original float32 table to float16, once
+
+        Runs in the caller's transaction, so the copy, the removal of the
+        old table and the version bump commit together.
+
+        Args:
+            conn: Open connection to the cache file
+        """
+        has_legacy_table = conn.execute(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'embedding_cache'"
+        ).fetchone()
+        if has_legacy_table:
+            rows = conn.execute("SELECT key, embedding FROM embedding_cache")
+            converted = [
+                (key, np.frombuffer(blob, dtype=np.float32).astype(CACHE_DTYPE))
+                for key, blob in rows.fetchall()
+            ]
+            conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache_f16 (key, embedding) "
+                "VALUES (?, ?)",
+                ((key, embedding.tobytes()) for key, embedding in converted),
+            )
+            conn.execute("DROP TABLE embedding_cache")
+            log.info("💾 Converted float32 disk cache entries to float16")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def make_key(self, text: str) -> bytes:
+        """
+        Hash model name and text into a fixed-size cache key
+
+        Args:
+            text: Input text
+
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached embeddings
+
+        Args:
+            keys: Cache keys from make_key
+
+        Returns:
+            Dictionary mapping each cached key to its float32 embedding
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with sqlite3.connect(self.cache_path) as conn:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i : i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, embedding FROM embedding_cache_f16 WHERE key IN ({placeholders})",
+                    batch,
+                )
+                for key, embedding_bytes in rows:
+                    found[key] = np.frombuffer(
+                        embedding_bytes, dtype=CACHE_DTYPE
+                    ).astype(np.float32)
+
+        log.info(f"🎯 Disk embedding cache hits: {len(found)}/{len(unique_keys)}")
+        return found
+
+    def put_many(self, keys: List[bytes], embeddings: np.ndarray):
+        """
+        Store embeddings in the cache
+
+        Args:
+            keys: Cache keys from make_key
+            embeddings: Embedding vectors aligned with keys; stored as float16
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=CACHE_DTYPE)
+
+        with sqlite3.connect(self.cache_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache_f16 (key, embedding) VALUES (?, ?)",
+                zip(keys, (embedding.tobytes() for embedding in embeddings)),
+            )
+
+        log.info(f"💾 Stored {len(keys)} embeddings in disk cache")
@@ -3,12 +3,24 @@ FAISS service for vector similarity search
 """
 
 import faiss
+import math
 import numpy as np
 import pickle
 from typing import List
 from pathlib import Path
 from src.utils.logger import log
-from config.settings import FAISS_INDEX_PATH
+from config.settings import (
+    FAISS_INDEX_PATH,
+    FAISS_HNSW_M,
+    FAISS_HNSW_EF_CONSTRUCTION,
+    FAISS_HNSW_EF_SEARCH,
+    FAISS_IVFPQ_MIN_VECTORS,
+    FAISS_IVFPQ_M,
+    FAISS_IVFPQ_NPROBE,
+)
+
+# Vectors per add() call when building on GPU
+FAISS_GPU_ADD_BATCH_SIZE = 8192
 
 
 class FAISSService:
@@ -44,11 +56,22 @@ class FAISSService:
             # Normalize embeddings for cosine similarity
             faiss.normalize_L2(embeddings)
 
-            # Create index - using IndexFlatIP for cosine similarity
-            self.index = faiss.IndexFlatIP(self.dimension)
-
-            # Add embeddings to index
-            self.index.add(embeddings.astype(np.float32))
+            if len(embeddings) >= FAISS_IVFPQ_MIN_VECTORS:
+                self.index = self._build_ivfpq_index(embeddings.astype(np.float32))
+            else:
+                # Create index - HNSW graph over float16 vectors with inner
+                # product (cosine similarity), so queries visit O(log N) vectors
+                self.index = faiss.IndexHNSWSQ(
+                    self.dimension,
+                    faiss.ScalarQuantizer.QT_fp16,
+                    FAISS_HNSW_M,
+                    faiss.METRIC_INNER_PRODUCT,
+                )
+                self.index.hnsw.efConstruction = FAISS_HNSW_EF_CONSTRUCTION
+                self.index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+
+                # Add embeddings to index
+                self.index.add(embeddings.astype(np.float32))
 
             # Create ID mapping
             self.id_map = {i: chunk_id for i, chunk_id in enumerate(chunk_ids)}
@@ -59,6 +82,51 @@ class FAISSService:
             log.error(f"Error creating FAISS index: {e}")
             raise
 
+    def _build_ivfpq_index(self, embeddings: np.ndarray) -> faiss.Index:
+        """
+        Train and fill an IVF-PQ index for a large corpus
+
+        Each vector is stored as FAISS_IVFPQ_M one-byte codes, far smaller
+        than the fp16 HNSW index, and a query scans only the
+        FAISS_IVFPQ_NPROBE closest of about 4*sqrt(N) inverted lists.
+        Training and adding run on the first GPU when faiss has one; the
+        result is always a CPU index, so it saves and loads the same way.
+
+        Args:
+            embeddings: Normalized float32 embedding vectors
+
+        Returns:
+            Trained IVF-PQ index holding all embeddings
+        """
+        nlist = int(4 * math.sqrt(len(embeddings)))
+        quantizer = faiss.IndexFlatIP(self.dimension)
+        index = faiss.IndexIVFPQ(
+            quantizer,
+            self.dimension,
+            nlist,
+            FAISS_IVFPQ_M,
+            8,
+            faiss.METRIC_INNER_PRODUCT,
+        )
+
+        use_gpu = faiss.get_num_gpus() > 0
+        device = "GPU" if use_gpu else "CPU"
+        log.info(f"Training IVF-PQ index with {nlist} lists on {device}")
+        if use_gpu:
+            resources = faiss.StandardGpuResources()
+            gpu_index = faiss.index_cpu_to_gpu(resources, 0, index)
+            gpu_index.train(embeddings)
+            # Bounded batches keep temporary GPU memory flat during add
+            for start in range(0, len(embeddings), FAISS_GPU_ADD_BATCH_SIZE):
+                gpu_index.add(embeddings[start : start + FAISS_GPU_ADD_BATCH_SIZE])
+            index = faiss.index_gpu_to_cpu(gpu_index)
+        else:
+            index.train(embeddings)
+            index.add(embeddings)
+
+        index.nprobe = FAISS_IVFPQ_NPROBE
+        return index
+
     def save_index(self):
         """Save FAISS index to disk"""
         if self.index is None:
@@ -100,6 +168,10 @@ class FAISSService:
 
             # Load FAISS index
             self.index = faiss.read_index(index_file)
+            if isinstance(self.index, faiss.IndexHNSW):
+                self.index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+            elif isinstance(self.index, faiss.IndexIVF):
+                self.index.nprobe = FAISS_IVFPQ_NPROBE
 
             # Load metadata
             with open(metadata_file, "rb") as f:
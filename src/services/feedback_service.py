@@ -2,10 +2,14 @@
 Feedback Service for managing user feedback and evaluation metrics
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from sqlalchemy import text
-from src.services.postgres_database_service import PostgresDatabaseService
+from src.services.postgres_database_service import (
+    DB_POOL_SIZE,
+    PostgresDatabaseService,
+)
 from src.models.feedback import (
     FeedbackRequest,
     FeedbackResponse,
@@ -18,6 +22,12 @@ from src.models.feedback import (
 )
 from src.utils.logger import log
 
+# Runs the dashboard's section queries for every request, sized to the
+# database connection pool
+_DASHBOARD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=DB_POOL_SIZE, thread_name_prefix="dashboard-metrics"
+)
+
 
 class FeedbackService:
     """Service for managing user feedback and evaluation"""
@@ -35,102 +45,67 @@ class FeedbackService:
     def _init_feedback_tables(self):
         """Create feedback-related tables if they don't exist"""
         try:
-            with self.db_service.engine.connect() as conn:
-                # Create feedback table
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS feedback (
-                        id SERIAL PRIMARY KEY,
-                        conversation_id VARCHAR(255) NOT NULL,
-                        message_id VARCHAR(255),
-                        query TEXT NOT NULL,
-                        answer TEXT NOT NULL,
-                        rating VARCHAR(20) NOT NULL,
-                        comment TEXT,
-                        chunk_ids INTEGER[] DEFAULT '{}',
-                        user_id VARCHAR(255),
-                        session_id VARCHAR(255),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
-
-                # Create chunk_performance table for tracking chunk effectiveness
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS chunk_performance (
-                        id SERIAL PRIMARY KEY,
-                        chunk_id INTEGER NOT NULL REFERENCES chunks(id),
-                        times_used INTEGER DEFAULT 0,
-                        positive_feedback INTEGER DEFAULT 0,
-                        negative_feedback INTEGER DEFAULT 0,
-                        neutral_feedback INTEGER DEFAULT 0,
-                        effectiveness_score FLOAT DEFAULT 0.5,
-                        retrieval_weight FLOAT DEFAULT 1.0,
-                        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(chunk_id)
-                    )
-                """
-                    )
-                )
-
-                # Create query_metrics table for tracking query performance
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS query_metrics (
-                        id SERIAL PRIMARY KEY,
-                        query TEXT NOT NULL,
-                        response_time_ms FLOAT,
-                        chunks_retrieved INTEGER,
-                        confidence_score FLOAT,
-                        has_feedback BOOLEAN DEFAULT FALSE,
-                        feedback_id INTEGER REFERENCES feedback(id),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
+            # All schema statements go out as one script in a single round trip
+            schema_sql = """
+                -- Create feedback table
+                CREATE TABLE IF NOT EXISTS feedback (
+                    id SERIAL PRIMARY KEY,
+                    conversation_id TEXT NOT NULL,
+                    message_id TEXT,
+                    query TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    rating TEXT NOT NULL,
+                    comment TEXT,
+                    chunk_ids INTEGER[] DEFAULT '{}',
+                    user_id TEXT,
+                    session_id TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create chunk_performance table for tracking chunk effectiveness
+                CREATE TABLE IF NOT EXISTS chunk_performance (
+                    id SERIAL PRIMARY KEY,
+                    chunk_id INTEGER NOT NULL REFERENCES chunks(id),
+                    times_used INTEGER DEFAULT 0,
+                    positive_feedback INTEGER DEFAULT 0,
+                    negative_feedback INTEGER DEFAULT 0,
+                    neutral_feedback INTEGER DEFAULT 0,
+                    effectiveness_score FLOAT DEFAULT 0.5,
+                    retrieval_weight FLOAT DEFAULT 1.0,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(chunk_id)
+                );
+
+                -- Create query_metrics table for tracking query performance
+                CREATE TABLE IF NOT EXISTS query_metrics (
+                    id SERIAL PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    response_time_ms FLOAT,
+                    chunks_retrieved INTEGER,
+                    confidence_score FLOAT,
+                    has_feedback BOOLEAN DEFAULT FALSE,
+                    feedback_id INTEGER REFERENCES feedback(id),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create indexes
+                CREATE INDEX IF NOT EXISTS idx_feedback_conversation
+                ON feedback(conversation_id);
+
+                CREATE INDEX IF NOT EXISTS idx_feedback_rating
+                ON feedback(rating);
+
+                CREATE INDEX IF NOT EXISTS idx_feedback_created
+                ON feedback(created_at);
+
+                CREATE INDEX IF NOT EXISTS idx_chunk_performance_chunk
+                ON chunk_performance(chunk_id);
+            """
 
-                # Create indexes
-                conn.execute(
-                    text(
-                        """
-                    CREATE INDEX IF NOT EXISTS idx_feedback_conversation 
-                    ON feedback(conversation_id)
-                """
-                    )
-                )
-                conn.execute(
-                    text(
-                        """
-                    CREATE INDEX IF NOT EXISTS idx_feedback_rating 
-                    ON feedback(rating)
-                """
-                    )
-                )
-                conn.execute(
-                    text(
-                        """
-                    CREATE INDEX IF NOT EXISTS idx_feedback_created 
-                    ON feedback(created_at)
-                """
-                    )
-                )
-                conn.execute(
-                    text(
-                        """
-                    CREATE INDEX IF NOT EXISTS idx_chunk_performance_chunk 
-                    ON chunk_performance(chunk_id)
-                """
-                    )
-                )
+            with self.db_service.engine.begin() as conn:
+                conn.execute(text(schema_sql))
 
-                conn.commit()
-                log.info("✅ Feedback tables initialized successfully")
+            log.info("✅ Feedback tables initialized successfully")
 
         except Exception as e:
             log.error(f"❌ Error initializing feedback tables: {e}")
@@ -207,59 +182,38 @@ class FeedbackService:
             chunk_ids: List of chunk IDs used in the answer
             rating: User rating
         """
+        if not chunk_ids:
+            return
+
+        if rating == FeedbackRating.POSITIVE:
+            feedback_column = "positive_feedback"
+        elif rating == FeedbackRating.NEGATIVE:
+            feedback_column = "negative_feedback"
+        else:
+            feedback_column = "neutral_feedback"
+
         try:
             session = self.db_service.SessionLocal()
 
-            for chunk_id in chunk_ids:
-                # Upsert chunk performance record
-                if rating == FeedbackRating.POSITIVE:
-                    session.execute(
-                        text(
-                            """
-                        INSERT INTO chunk_performance (chunk_id, times_used, positive_feedback)
-                        VALUES (:chunk_id, 1, 1)
-                        ON CONFLICT (chunk_id) 
-                        DO UPDATE SET 
-                            times_used = chunk_performance.times_used + 1,
-                            positive_feedback = chunk_performance.positive_feedback + 1,
-                            last_updated = CURRENT_TIMESTAMP
-                    """
-                        ),
-                        {"chunk_id": chunk_id},
-                    )
-                elif rating == FeedbackRating.NEGATIVE:
-                    session.execute(
-                        text(
-                            """
-                        INSERT INTO chunk_performance (chunk_id, times_used, negative_feedback)
-                        VALUES (:chunk_id, 1, 1)
-                        ON CONFLICT (chunk_id) 
-                        DO UPDATE SET 
-                            times_used = chunk_performance.times_used + 1,
-                            negative_feedback = chunk_performance.negative_feedback + 1,
-                            last_updated = CURRENT_TIMESTAMP
-                    """
-                        ),
-                        {"chunk_id": chunk_id},
-                    )
-                else:
-                    session.execute(
-                        text(
-                            """
-                        INSERT INTO chunk_performance (chunk_id, times_used, neutral_feedback)
-                        VALUES (:chunk_id, 1, 1)
-                        ON CONFLICT (chunk_id) 
-                        DO UPDATE SET 
-                            times_used = chunk_performance.times_used + 1,
-                            neutral_feedback = chunk_performance.neutral_feedback + 1,
-                            last_updated = CURRENT_TIMESTAMP
-                    """
-                        ),
-                        {"chunk_id": chunk_id},
-                    )
+            # One executemany for every chunk; the engine sends it through
+            # psycopg2's execute_batch rather than a round trip per chunk
+            session.execute(
+                text(
+                    f"""
+                INSERT INTO chunk_performance (chunk_id, times_used, {feedback_column})
+                VALUES (:chunk_id, 1, 1)
+                ON CONFLICT (chunk_id)
+                DO UPDATE SET
+                    times_used = chunk_performance.times_used + 1,
+                    {feedback_column} = chunk_performance.{feedback_column} + 1,
+                    last_updated = CURRENT_TIMESTAMP
+            """
+                ),
+                [{"chunk_id": chunk_id} for chunk_id in chunk_ids],
+            )
 
-                # Update effectiveness score
-                self._recalculate_chunk_effectiveness(session, chunk_id)
+            # Update effectiveness scores
+            self._recalculate_chunk_effectiveness(session, chunk_ids)
 
             session.commit()
 
@@ -269,58 +223,33 @@ class FeedbackService:
         finally:
             session.close()
 
-    def _recalculate_chunk_effectiveness(self, session, chunk_id: int):
+    def _recalculate_chunk_effectiveness(self, session, chunk_ids: List[int]):
         """
-        Recalculate chunk effectiveness score based on feedback history
+        Recalculate chunk effectiveness scores based on feedback history
 
         Score formula: (positive * 1.0 + neutral * 0.5) / total_feedback
-        With a weight adjustment for retrieval ranking
+        With a weight adjustment for retrieval ranking: positive feedback
+        increases weight, negative decreases, clamped to [0.1, 2.0]
         """
         try:
-            result = session.execute(
+            # Set-based, so all chunks are rescored in one statement
+            session.execute(
                 text(
                     """
-                SELECT positive_feedback, negative_feedback, neutral_feedback, times_used
-                FROM chunk_performance
-                WHERE chunk_id = :chunk_id
+                UPDATE chunk_performance
+                SET effectiveness_score = (positive_feedback * 1.0 + neutral_feedback * 0.5)
+                        / (positive_feedback + negative_feedback + neutral_feedback),
+                    retrieval_weight = GREATEST(
+                        0.1,
+                        LEAST(2.0, 1.0 + (positive_feedback - negative_feedback) * 0.1)
+                    )
+                WHERE chunk_id = ANY(:chunk_ids)
+                  AND positive_feedback + negative_feedback + neutral_feedback > 0
             """
                 ),
-                {"chunk_id": chunk_id},
+                {"chunk_ids": list(chunk_ids)},
             )
 
-            row = result.fetchone()
-            if row:
-                positive, negative, neutral, times_used = row
-                total = positive + negative + neutral
-
-                if total > 0:
-                    # Calculate effectiveness score (0-1)
-                    effectiveness = (positive * 1.0 + neutral * 0.5) / total
-
-                    # Calculate retrieval weight adjustment
-                    # Positive feedback increases weight, negative decreases
-                    base_weight = 1.0
-                    weight_adjustment = (positive - negative) * 0.1
-                    retrieval_weight = max(
-                        0.1, min(2.0, base_weight + weight_adjustment)
-                    )
-
-                    session.execute(
-                        text(
-                            """
-                        UPDATE chunk_performance
-                        SET effectiveness_score = :effectiveness,
-                            retrieval_weight = :weight
-                        WHERE chunk_id = :chunk_id
-                    """
-                        ),
-                        {
-                            "effectiveness": effectiveness,
-                            "weight": retrieval_weight,
-                            "chunk_id": chunk_id,
-                        },
-                    )
-
         except Exception as e:
             log.error(f"❌ Error recalculating chunk effectiveness: {e}")
 
@@ -586,11 +515,23 @@ class FeedbackService:
         try:
             session = self.db_service.SessionLocal()
 
-            # Get overall stats
-            overall_stats = self.get_feedback_stats(days=30)
-
-            # Get daily stats
-            daily_stats = self.get_daily_stats(days=7)
+            # The sections are independent reads that each take their own
+            # pooled connection, so they run concurrently rather than one
+            # round trip after another. The executor is shared across
+            # requests so they cannot together exceed the connection pool
+            overall_future = _DASHBOARD_EXECUTOR.submit(
+                self.get_feedback_stats, days=30
+            )
+            daily_future = _DASHBOARD_EXECUTOR.submit(self.get_daily_stats, days=7)
+            top_future = _DASHBOARD_EXECUTOR.submit(
+                self.get_chunk_performance, top_n=5, worst=False
+            )
+            worst_future = _DASHBOARD_EXECUTOR.submit(
+                self.get_chunk_performance, top_n=5, worst=True
+            )
+            negative_future = _DASHBOARD_EXECUTOR.submit(
+                self.get_recent_negative_feedback, limit=5
+            )
 
             # Get query metrics
             result = session.execute(
@@ -607,6 +548,7 @@ class FeedbackService:
             )
 
             row = result.fetchone()
+
             avg_response_time = row[0] or 0
             total_queries = row[1] or 0
             queries_with_feedback = row[2] or 0
@@ -616,12 +558,11 @@ class FeedbackService:
                 else 0
             )
 
-            # Get top and worst chunks
-            top_chunks = self.get_chunk_performance(top_n=5, worst=False)
-            worst_chunks = self.get_chunk_performance(top_n=5, worst=True)
-
-            # Get recent negative feedback
-            recent_negative = self.get_recent_negative_feedback(limit=5)
+            overall_stats = overall_future.result()
+            daily_stats = daily_future.result()
+            top_chunks = top_future.result()
+            worst_chunks = worst_future.result()
+            recent_negative = negative_future.result()
 
             return DashboardMetrics(
                 overall_stats=overall_stats,
@@ -2,19 +2,44 @@
 Hybrid Retrieval Service combining dense (vector) and sparse (BM25) search
 """
 
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, List, Tuple
+import bm25s
 import numpy as np
-from rank_bm25 import BM25Okapi
 from sqlalchemy import text
+from src.services.postgres_database_service import to_vector_literal
 from src.utils.logger import log
 from config.settings import (
     DENSE_WEIGHT,
     DENSE_SIMILARITY_THRESHOLD,
+    PGVECTOR_HNSW_EF_SEARCH,
     SPARSE_SIMILARITY_THRESHOLD,
     TOP_K_RESULTS,
 )
 
 
+def tokenize_corpus(texts: Iterable[str]) -> bm25s.tokenization.Tokenized:
+    """
+    Tokenize documents for BM25 straight into token IDs
+
+    Whitespace tokens are lowercased, matching query tokenization in
+    _sparse_search. Assigning IDs while splitting lets bm25s index the IDs
+    directly instead of making a second pass over every token string to
+    build its vocabulary.
+
+    Args:
+        texts: Document contents
+
+    Returns:
+        Token IDs per document plus the token-to-ID vocabulary
+    """
+    vocab = {}
+    ids = [
+        [vocab.setdefault(token, len(vocab)) for token in text.lower().split()]
+        for text in texts
+    ]
+    return bm25s.tokenization.Tokenized(ids=ids, vocab=vocab)
+
+
 class HybridRetrievalService:
     """Service for hybrid retrieval combining dense and sparse search"""
 
@@ -30,6 +55,7 @@ class HybridRetrievalService:
         self.embedding_service = embedding_service
         self.bm25_index = None
         self.chunk_ids_list = []
+        self.chunk_ids_array = np.empty(0, dtype=np.int64)
         self.chunks_dict = {}
         self._build_bm25_index()
 
@@ -46,23 +72,17 @@ class HybridRetrievalService:
                 return
 
             # Prepare corpus for BM25
-            corpus = []
-            self.chunk_ids_list = []
-            self.chunks_dict = {}
-
-            for chunk in chunks:
-                # Tokenize content (simple split by whitespace)
-                tokens = chunk["content"].lower().split()
-                corpus.append(tokens)
+            corpus = tokenize_corpus(chunk["content"] for chunk in chunks)
+            self.chunk_ids_list = [chunk["id"] for chunk in chunks]
+            self.chunks_dict = dict(zip(self.chunk_ids_list, chunks))
 
-                chunk_id = chunk["id"]
-                self.chunk_ids_list.append(chunk_id)
-                self.chunks_dict[chunk_id] = chunk
+            # Build BM25 index; bm25s precomputes a sparse score matrix so
+            # queries are a column lookup instead of a per-document walk
+            self.bm25_index = bm25s.BM25(k1=1.5, b=0.75)
+            self.bm25_index.index(corpus, show_progress=False)
+            self.chunk_ids_array = np.asarray(self.chunk_ids_list)
 
-            # Build BM25 index
-            self.bm25_index = BM25Okapi(corpus)
-
-            log.info(f"✅ BM25 index built with {len(corpus)} active documents")
+            log.info(f"✅ BM25 index built with {len(chunks)} active documents")
 
         except Exception as e:
             log.error(f"❌ Error building BM25 index: {e}")
@@ -85,26 +105,31 @@ class HybridRetrievalService:
             session = self.db_service.SessionLocal()
 
             # Convert embedding to string format for pgvector
-            embedding_list = query_embedding.tolist()
-            embedding_str = "[" + ",".join(str(x) for x in embedding_list) + "]"
+            embedding_str = to_vector_literal(query_embedding)
+
+            # Candidate list size for the HNSW index scan in this transaction
+            ef_search = max(PGVECTOR_HNSW_EF_SEARCH, top_k)
+            session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
 
             # Use pgvector cosine similarity with CAST instead of :: to avoid SQLAlchemy parsing issues
-            # Only retrieve chunks that are active (is_active = true)
+            # Only retrieve chunks that are active (is_active = true).
+            # Ordering by the raw distance operator lets the HNSW index serve
+            # the ORDER BY ... LIMIT; ordering by similarity would scan every row
             result = session.execute(
                 text(
                     """
-                SELECT e.chunk_id, 1 - (e.embedding <=> CAST(:query_embedding AS vector)) as similarity
+                SELECT e.chunk_id, 1 - (e.embedding <=> CAST(:query_embedding AS halfvec)) as similarity
                 FROM embeddings e
                 JOIN chunks c ON e.chunk_id = c.id
                 WHERE c.is_active = true 
-                  AND 1 - (e.embedding <=> CAST(:query_embedding AS vector)) > :threshold
-                ORDER BY similarity DESC
+                  AND e.embedding <=> CAST(:query_embedding AS halfvec) < :max_distance
+                ORDER BY e.embedding <=> CAST(:query_embedding AS halfvec)
                 LIMIT :top_k
             """
                 ),
                 {
                     "query_embedding": embedding_str,
-                    "threshold": DENSE_SIMILARITY_THRESHOLD,
+                    "max_distance": 1 - DENSE_SIMILARITY_THRESHOLD,
                     "top_k": top_k,
                 },
             )
@@ -139,6 +164,8 @@ class HybridRetrievalService:
 
             # Tokenize query
             query_tokens = query.lower().split()
+            if not query_tokens:
+                return []
 
             # Get BM25 scores
             scores = self.bm25_index.get_scores(query_tokens)
@@ -146,12 +173,14 @@ class HybridRetrievalService:
             # Get top-k results
             top_indices = np.argsort(scores)[::-1][:top_k]
 
-            results = []
-            for idx in top_indices:
-                score = float(scores[idx])
-                if score > SPARSE_SIMILARITY_THRESHOLD:
-                    chunk_id = self.chunk_ids_list[idx]
-                    results.append((chunk_id, score))
+            # Apply the score threshold as one array mask instead of per index
+            top_indices = top_indices[scores[top_indices] > SPARSE_SIMILARITY_THRESHOLD]
+            results = list(
+                zip(
+                    self.chunk_ids_array[top_indices].tolist(),
+                    scores[top_indices].tolist(),
+                )
+            )
 
             log.info(f"🔍 Sparse search found {len(results)} results")
             return results
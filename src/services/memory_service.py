@@ -12,7 +12,10 @@ import json
 from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy import text
 
-from src.services.postgres_database_service import PostgresDatabaseService
+from src.services.postgres_database_service import (
+    PostgresDatabaseService,
+    to_vector_literal,
+)
 from src.services.embedding_service import EmbeddingService
 from src.models.memory import (
     ConversationMessage,
@@ -59,72 +62,47 @@ class ConversationMemoryService:
     def _init_memory_tables(self):
         """Create memory-related tables if they don't exist"""
         try:
-            with self.db_service.engine.connect() as conn:
-                # Create conversation_memory table
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS conversation_memory (
-                        id SERIAL PRIMARY KEY,
-                        conversation_id VARCHAR(255) NOT NULL,
-                        role VARCHAR(20) NOT NULL,
-                        content TEXT NOT NULL,
-                        turn_number INTEGER NOT NULL,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        metadata JSONB DEFAULT '{}'
-                    )
-                """
-                    )
-                )
+            from config.settings import EMBEDDING_DIMENSION
+
+            # All schema statements go out as one script in a single round trip
+            schema_sql = f"""
+                -- Create conversation_memory table
+                CREATE TABLE IF NOT EXISTS conversation_memory (
+                    id SERIAL PRIMARY KEY,
+                    conversation_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    turn_number INTEGER NOT NULL,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    metadata JSONB DEFAULT '{{}}'
+                );
+
+                -- Create memory_summaries table with vector embedding
+                CREATE TABLE IF NOT EXISTS memory_summaries (
+                    id SERIAL PRIMARY KEY,
+                    conversation_id TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    turn_start INTEGER NOT NULL,
+                    turn_end INTEGER NOT NULL,
+                    embedding vector({EMBEDDING_DIMENSION}),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create indexes
+                CREATE INDEX IF NOT EXISTS idx_conv_memory_conv_id
+                ON conversation_memory(conversation_id);
+
+                CREATE INDEX IF NOT EXISTS idx_conv_memory_turn
+                ON conversation_memory(conversation_id, turn_number);
+
+                CREATE INDEX IF NOT EXISTS idx_memory_summaries_conv_id
+                ON memory_summaries(conversation_id);
+            """
 
-                # Create memory_summaries table with vector embedding
-                # Use EMBEDDING_DIMENSION from settings
-                from config.settings import EMBEDDING_DIMENSION
+            with self.db_service.engine.begin() as conn:
+                conn.execute(text(schema_sql))
 
-                conn.execute(
-                    text(
-                        f"""
-                    CREATE TABLE IF NOT EXISTS memory_summaries (
-                        id SERIAL PRIMARY KEY,
-                        conversation_id VARCHAR(255) NOT NULL,
-                        summary TEXT NOT NULL,
-                        turn_start INTEGER NOT NULL,
-                        turn_end INTEGER NOT NULL,
-                        embedding vector({EMBEDDING_DIMENSION}),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
-
-                # Create indexes
-                conn.execute(
-                    text(
-                        """
-                    CREATE INDEX IF NOT EXISTS idx_conv_memory_conv_id 
-                    ON conversation_memory(conversation_id)
-                """
-                    )
-                )
-                conn.execute(
-                    text(
-                        """
-                    CREATE INDEX IF NOT EXISTS idx_conv_memory_turn 
-                    ON conversation_memory(conversation_id, turn_number)
-                """
-                    )
-                )
-                conn.execute(
-                    text(
-                        """
-                    CREATE INDEX IF NOT EXISTS idx_memory_summaries_conv_id 
-                    ON memory_summaries(conversation_id)
-                """
-                    )
-                )
-
-                conn.commit()
-                log.info("✅ Memory tables initialized successfully")
+            log.info("✅ Memory tables initialized successfully")
 
         except Exception as e:
             log.error(f"❌ Error initializing memory tables: {e}")
@@ -362,9 +340,7 @@ class ConversationMemoryService:
             if query_embedding is None:
                 return []
 
-            embedding_str = (
-                "[" + ",".join(str(x) for x in query_embedding.tolist()) + "]"
-            )
+            embedding_str = to_vector_literal(query_embedding)
 
             session = self.db_service.SessionLocal()
 
@@ -469,9 +445,7 @@ class ConversationMemoryService:
                 embedding = self.embedding_service.generate_embedding(summary)
                 embedding_str = None
                 if embedding is not None:
-                    embedding_str = (
-                        "[" + ",".join(str(x) for x in embedding.tolist()) + "]"
-                    )
+                    embedding_str = to_vector_literal(embedding)
 
                 # Save summary
                 session.execute(
@@ -719,9 +693,7 @@ Tóm tắt:"""
             if query_embedding is None:
                 return []
 
-            embedding_str = (
-                "[" + ",".join(str(x) for x in query_embedding.tolist()) + "]"
-            )
+            embedding_str = to_vector_literal(query_embedding)
 
             session = self.db_service.SessionLocal()
 
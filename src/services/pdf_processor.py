@@ -2,16 +2,136 @@
 Service for processing PDF files
 """
 
-import json
+import dataclasses
+import os
+from concurrent.futures import ProcessPoolExecutor
+import orjson
 import PyPDF2
 import pdfplumber
 from pathlib import Path
-from typing import List
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List
 from src.models.schemas import DocumentChunk
 from src.utils.logger import log
 from src.utils.heading_chunker import HeadingChunker
 from src.services.gemini_pdf_service import GeminiPDFService
-from config.settings import PDF_DIR, NEW_PDF_DIR, PROCESSED_DIR
+from config.settings import (
+    PDF_DIR,
+    NEW_PDF_DIR,
+    PROCESSED_DIR,
+    PDF_PROCESS_WORKERS,
+    GEMINI_PDF_WORKERS,
+)
+
+
+# Chunks are stored as newline-delimited JSON; earlier versions wrote a
+# single JSON array to heading_chunks.json
+CHUNKS_FILENAME = "heading_chunks.jsonl"
+LEGACY_CHUNKS_FILENAME = "heading_chunks.json"
+
+
+def resolve_chunks_file(processed_dir: Path) -> Path:
+    """
+    Get the chunks file to read from a processed directory
+
+    Falls back to a legacy heading_chunks.json when no heading_chunks.jsonl
+    has been written yet.
+
+    Args:
+        processed_dir: Directory holding the chunks file
+
+    Returns:
+        Path to the chunks file, which may not exist
+    """
+    chunks_file = processed_dir / CHUNKS_FILENAME
+    legacy_file = processed_dir / LEGACY_CHUNKS_FILENAME
+    if not chunks_file.exists() and legacy_file.exists():
+        return legacy_file
+    return chunks_file
+
+
+def _is_legacy_array(chunks_file: Path) -> bool:
+    """Check whether a chunks file uses the older single JSON array format"""
+    with open(chunks_file, "rb") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+    return first == b"["
+
+
+def iter_chunk_records(chunks_file: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream chunk dictionaries from a chunks file
+
+    Chunks are stored as newline-delimited JSON, one object per line, so the
+    file is decoded one record at a time. A legacy .json file in the older
+    single JSON array format is still accepted.
+
+    Args:
+        chunks_file: Path to the chunks file
+
+    Yields:
+        One chunk dictionary per stored chunk
+    """
+    if chunks_file.suffix == ".json" and _is_legacy_array(chunks_file):
+        # Legacy array format has to be decoded in one go
+        with open(chunks_file, "rb") as f:
+            yield from orjson.loads(f.read())
+        return
+
+    with open(chunks_file, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def _write_records(f: BinaryIO, records: Iterable[Dict[str, Any]]) -> int:
+    """Encode records as JSON lines into an open binary file"""
+    count = 0
+    for record in records:
+        f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+        count += 1
+    return count
+
+
+def write_chunk_records(chunks_file: Path, records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write chunk dictionaries as newline-delimited JSON
+
+    Args:
+        chunks_file: Path to the chunks file
+        records: Chunk dictionaries to write
+
+    Returns:
+        Number of chunks written
+    """
+    with open(chunks_file, "wb") as f:
+        return _write_records(f, records)
+
+
+def append_chunk_records(chunks_file: Path, records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Append chunk dictionaries to a chunks file without loading existing ones
+
+    If the file does not exist yet but a legacy .json file sits next to it,
+    the legacy chunks are converted into it first so none are left behind.
+
+    Args:
+        chunks_file: Path to the chunks file
+        records: Chunk dictionaries to append
+
+    Returns:
+        Number of chunks appended
+    """
+    legacy_file = chunks_file.with_name(LEGACY_CHUNKS_FILENAME)
+    if not chunks_file.exists() and legacy_file.exists():
+        converted = chunks_file.with_name(chunks_file.name + ".tmp")
+        write_chunk_records(converted, iter_chunk_records(legacy_file))
+        os.replace(converted, chunks_file)
+        legacy_file.unlink()
+        log.info(f"Converted {legacy_file} to {chunks_file}")
+
+    with open(chunks_file, "ab") as f:
+        return _write_records(f, records)
 
 
 class PDFProcessor:
@@ -76,6 +196,42 @@ class PDFProcessor:
             log.error(f"Error processing PDF with headings: {e}")
             return []
 
+    def process_pdfs_parallel(self, pdf_paths: List[Path]) -> List[DocumentChunk]:
+        """
+        Process several PDF files with heading-based chunking across processes
+
+        Local extraction and chunking are CPU-bound and independent per file,
+        so each file runs in a worker process, up to PDF_PROCESS_WORKERS.
+        When Gemini Vision extraction is enabled every worker calls the API,
+        so the pool is capped at GEMINI_PDF_WORKERS instead. Chunks are
+        returned in the order of pdf_paths, as a sequential loop would
+        produce them.
+
+        Args:
+            pdf_paths: Paths to PDF files
+
+        Returns:
+            List of document chunks from all files
+        """
+        max_workers = GEMINI_PDF_WORKERS if self.use_gemini else PDF_PROCESS_WORKERS
+        workers = min(max_workers, len(pdf_paths))
+        if workers <= 1:
+            return [
+                chunk
+                for pdf_path in pdf_paths
+                for chunk in self.process_pdf_with_headings(pdf_path)
+            ]
+
+        all_chunks = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_pdf_worker,
+            initargs=(self.use_gemini,),
+        ) as executor:
+            for chunks in executor.map(_process_pdf_in_worker, pdf_paths):
+                all_chunks.extend(chunks)
+        return all_chunks
+
     def extract_text_from_pdf(
         self, pdf_path: Path, use_gemini: bool = None
     ) -> List[tuple[int, str]]:
@@ -149,16 +305,18 @@ class PDFProcessor:
             List of document chunks
         """
         try:
-            chunks_file = self.processed_dir / "heading_chunks.json"
+            chunks_file = resolve_chunks_file(self.processed_dir)
 
             if not chunks_file.exists():
                 log.warning(f"Chunks file not found: {chunks_file}")
                 return []
 
-            with open(chunks_file, "r", encoding="utf-8") as f:
-                chunks_data = json.load(f)
-
-            chunks = [DocumentChunk(**chunk_data) for chunk_data in chunks_data]
+            # Build each chunk as its record is decoded rather than holding the
+            # whole decoded file alongside the chunk objects
+            chunks = [
+                DocumentChunk(**chunk_data)
+                for chunk_data in iter_chunk_records(chunks_file)
+            ]
             log.info(f"Loaded {len(chunks)} heading-based chunks from {chunks_file}")
 
             return chunks
@@ -169,25 +327,16 @@ class PDFProcessor:
 
     def process_all_pdfs(self) -> List[DocumentChunk]:
         """Process all PDFs from both regular and scan directories"""
-        all_chunks = []
-
         # Process regular PDFs (can be copied)
         regular_pdf_files = list(self.pdf_dir.glob("*.pdf"))
         log.info(f"Found {len(regular_pdf_files)} regular PDF files in {self.pdf_dir}")
 
-        for pdf_path in regular_pdf_files:
-            log.info(f"Processing regular PDF: {pdf_path.name}")
-            chunks = self.process_pdf_with_headings(pdf_path)
-            all_chunks.extend(chunks)
-
         # Process scanned PDFs (use Gemini for better OCR)
         scan_pdf_files = list(self.new_pdf_dir.glob("*.pdf"))
         log.info(f"Found {len(scan_pdf_files)} scanned PDF files in {self.new_pdf_dir}")
 
-        for pdf_path in scan_pdf_files:
-            log.info(f"Processing scanned PDF with Gemini: {pdf_path.name}")
-            chunks = self.process_pdf_with_headings(pdf_path)
-            all_chunks.extend(chunks)
+        # Both sets go through the same path, so share one worker pool
+        all_chunks = self.process_pdfs_parallel(regular_pdf_files + scan_pdf_files)
 
         total_files = len(regular_pdf_files) + len(scan_pdf_files)
         if total_files == 0:
@@ -212,9 +361,7 @@ class PDFProcessor:
             log.info(
                 f"Processing {len(regular_pdf_files)} regular PDFs with traditional extraction"
             )
-            for pdf_path in regular_pdf_files:
-                chunks = self.process_pdf_with_headings(pdf_path)
-                all_chunks.extend(chunks)
+            all_chunks.extend(self.process_pdfs_parallel(regular_pdf_files))
 
         # Process scanned PDFs with Gemini (better OCR)
         scan_pdf_files = list(self.new_pdf_dir.glob("*.pdf"))
@@ -222,15 +369,13 @@ class PDFProcessor:
             log.info(
                 f"Processing {len(scan_pdf_files)} scanned PDFs with Gemini Vision API"
             )
-            for pdf_path in scan_pdf_files:
-                # Force Gemini usage for scanned PDFs
-                chunks = self.process_pdf_with_headings(pdf_path)
-                all_chunks.extend(chunks)
+            # Force Gemini usage for scanned PDFs
+            all_chunks.extend(self.process_pdfs_parallel(scan_pdf_files))
 
         return all_chunks
 
     def save_chunks_to_file(self, chunks: List[DocumentChunk]):
-        """Save chunks to a JSON file"""
+        """Save chunks to a JSON lines file"""
         if not chunks:
             log.warning("No chunks to save.")
             return
@@ -240,15 +385,26 @@ class PDFProcessor:
             self.processed_dir.mkdir(parents=True, exist_ok=True)
 
             # Define output file path
-            chunks_file = self.processed_dir / "heading_chunks.json"
-
-            # Convert chunks to dictionary format for JSON serialization
-            chunks_data = [chunk.dict() for chunk in chunks]
+            chunks_file = self.processed_dir / CHUNKS_FILENAME
 
-            with open(chunks_file, "w", encoding="utf-8") as f:
-                json.dump(chunks_data, f, ensure_ascii=False, indent=4)
+            write_chunk_records(chunks_file, (dataclasses.asdict(chunk) for chunk in chunks))
 
             log.info(f"Successfully saved {len(chunks)} chunks to {chunks_file}")
 
         except Exception as e:
             log.error(f"Error saving chunks to file: {e}")
+
+
+# Set once per worker process by _init_pdf_worker
+_worker_processor = None
+
+
+def _init_pdf_worker(use_gemini: bool):
+    """Build one PDFProcessor per worker process instead of pickling one per file"""
+    global _worker_processor
+    _worker_processor = PDFProcessor(use_gemini=use_gemini)
+
+
+def _process_pdf_in_worker(pdf_path: Path) -> List[DocumentChunk]:
+    """Process one PDF file in a worker process"""
+    return _worker_processor.process_pdf_with_headings(pdf_path)
@@ -2,13 +2,260 @@
 PostgreSQL database service for managing document chunks and embeddings with pgvector
 """
 
-from typing import List, Optional, Dict, Any
+import io
+import struct
+from functools import lru_cache
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import numpy as np
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from src.utils.logger import log
 from src.models.schemas import DocumentChunk
-from config.settings import DATABASE_URL
+from config.settings import (
+    DATABASE_URL,
+    DB_KEEPALIVES_COUNT,
+    DB_KEEPALIVES_IDLE,
+    DB_KEEPALIVES_INTERVAL,
+)
+
+# Backslash escapes required by COPY's text format
+COPY_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+# Bulk-load transactions return without waiting for the WAL flush. A crash
+# can lose only the last few commits, never corrupt data, and ingestion can
+# simply be re-run
+BULK_LOAD_SETTINGS = "SET LOCAL synchronous_commit = off"
+
+# halfvec and its operator classes first shipped in pgvector 0.7.0
+MIN_PGVECTOR_VERSION = (0, 7)
+
+# Rows fetched per round trip by server-side cursors in exports
+EXPORT_FETCH_SIZE = 1000
+
+# Connections each engine keeps open; also bounds the shared worker pools
+# that run independent reads in parallel
+DB_POOL_SIZE = 10
+
+
+@lru_cache(maxsize=None)
+def get_db_engine(database_url: str = DATABASE_URL):
+    """
+    Get the process-wide SQLAlchemy engine for a database URL
+
+    The engine is created once per URL, so every service instance and script
+    in the process shares the same connection pool. executemany() calls are
+    routed through psycopg2's execute_values / execute_batch helpers instead
+    of one round trip per parameter set, and TCP keepalives stop idle pooled
+    connections to a remote host from being dropped between requests.
+
+    Args:
+        database_url: PostgreSQL connection string
+    """
+    return create_engine(
+        database_url,
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=20,
+        pool_pre_ping=True,  # Verify connections before using
+        connect_args={
+            "keepalives": 1,
+            "keepalives_idle": DB_KEEPALIVES_IDLE,
+            "keepalives_interval": DB_KEEPALIVES_INTERVAL,
+            "keepalives_count": DB_KEEPALIVES_COUNT,
+        },
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=1000,
+        executemany_batch_page_size=500,
+    )
+
+
+def to_vector_literal(embedding: np.ndarray) -> str:
+    """
+    Format an embedding as a pgvector text literal for query parameters
+
+    Values are written with 7 significant digits instead of the up to 17
+    digits of repr(float). That is finer than the half-precision column
+    stores and than similarity ranking can resolve, and the literal is
+    around 40% shorter to send and for the server to parse.
+
+    Args:
+        embedding: Embedding vector
+
+    Returns:
+        Literal such as "[0.1234567,-0.0412]"
+    """
+    return "[" + ",".join(map("{:.7g}".format, embedding.tolist())) + "]"
+
+
+class _CopyTextStream(io.TextIOBase):
+    """
+    File-like reader that formats rows as COPY text lines on demand
+
+    copy_expert pulls fixed-size blocks from read(), so rows are formatted
+    as the server consumes them and the whole payload is never held in
+    memory at once.
+    """
+
+    def __init__(self, rows):
+        """
+        Args:
+            rows: Iterable of row tuples; None values are written as NULL
+        """
+        self._rows = iter(rows)
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    @staticmethod
+    def _format(row) -> str:
+        return (
+            "\t".join(
+                "\\N" if value is None else str(value).translate(COPY_TEXT_ESCAPES)
+                for value in row
+            )
+            + "\n"
+        )
+
+    def read(self, size: int = -1) -> str:
+        lines = [self._buffer]
+        buffered = len(self._buffer)
+        for row in self._rows:
+            line = self._format(row)
+            lines.append(line)
+            buffered += len(line)
+            if 0 <= size <= buffered:
+                break
+
+        data = "".join(lines)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+# Signature, flags field and header extension length of a binary COPY stream
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+
+
+def _embedding_row_type(dim: int) -> np.dtype:
+    """
+    Record layout of one (chunk_id, embedding) row in a binary COPY stream
+
+    Tuple field count, then each field as length + big-endian value;
+    halfvec's binary form is dim (int16), unused (int16), float2 values.
+
+    Args:
+        dim: Embedding dimension
+
+    Returns:
+        numpy structured dtype matching the row bytes exactly
+    """
+    return np.dtype(
+        [
+            ("field_count", ">i2"),
+            ("id_length", ">i4"),
+            ("chunk_id", ">i4"),
+            ("vector_length", ">i4"),
+            ("dim", ">i2"),
+            ("unused", ">i2"),
+            ("values", ">f2", (dim,)),
+        ]
+    )
+
+
+def _copy_binary_embeddings(
+    chunk_ids: List[int], embeddings: np.ndarray
+) -> io.BytesIO:
+    """
+    Encode (chunk_id, embedding) rows as a binary COPY stream
+
+    Every row is laid out in one numpy record array, so the vectors are
+    narrowed to half precision and byte-swapped in a single conversion
+    instead of being formatted as text one by one. The record array's buffer
+    is written into the stream directly, without an intermediate bytes copy.
+
+    Args:
+        chunk_ids: Chunk IDs
+        embeddings: Embedding vectors aligned with chunk_ids
+
+    Returns:
+        Stream holding the COPY ... FROM STDIN WITH (FORMAT binary) payload
+    """
+    count, dim = embeddings.shape
+    rows = np.empty(count, dtype=_embedding_row_type(dim))
+    rows["field_count"] = 2
+    rows["id_length"] = 4
+    rows["chunk_id"] = chunk_ids
+    rows["vector_length"] = 4 + 2 * dim
+    rows["dim"] = dim
+    rows["unused"] = 0
+    rows["values"] = embeddings
+
+    stream = io.BytesIO()
+    stream.write(COPY_BINARY_HEADER)
+    stream.write(memoryview(rows).cast("B"))
+    stream.write(struct.pack(">h", -1))
+    stream.seek(0)
+    return stream
+
+
+def _read_binary_embeddings(payload: bytes, dim: int):
+    """
+    Decode a binary COPY stream of (chunk_id, embedding) rows
+
+    The inverse of _copy_binary_embeddings: the rows are viewed as one
+    record array and widened to float32 in a single conversion, with no
+    text parsing of the vectors. Every row header is checked against dim,
+    so a column of another dimension or a NULL embedding raises instead of
+    being misread as vector values.
+
+    Args:
+        payload: Bytes of COPY ... TO STDOUT WITH (FORMAT binary) output
+        dim: Expected embedding dimension
+
+    Returns:
+        Tuple of (chunk_ids, float32 embeddings array)
+
+    Raises:
+        ValueError: If the stream does not hold halfvec(dim) rows
+    """
+    (extension_length,) = struct.unpack_from(">i", payload, 15)
+    start = len(COPY_BINARY_HEADER) + extension_length
+    if struct.unpack_from(">h", payload, len(payload) - 2)[0] != -1:
+        raise ValueError("Binary COPY stream does not end with a trailer")
+
+    # Every valid row has the same size, so all but the trailer is rows
+    body = memoryview(payload)[start:-2]
+    if len(body) >= 16:
+        # dim follows the field count (2), the chunk_id length and value (8)
+        # and the vector length (4)
+        (first_dim,) = struct.unpack_from(">h", body, 14)
+        if first_dim != dim:
+            raise ValueError(
+                f"Expected halfvec({dim}) embeddings, got halfvec({first_dim})"
+            )
+    row_type = _embedding_row_type(dim)
+    if len(body) % row_type.itemsize:
+        raise ValueError(f"Binary COPY stream does not hold whole halfvec({dim}) rows")
+
+    rows = np.frombuffer(body, dtype=row_type)
+    valid = (
+        (rows["field_count"] == 2)
+        & (rows["id_length"] == 4)
+        & (rows["vector_length"] == 4 + 2 * dim)
+        & (rows["dim"] == dim)
+    )
+    if not valid.all():
+        bad = int(np.argmin(valid))
+        raise ValueError(
+            f"Expected halfvec({dim}) embeddings, row for chunk "
+            f"{rows['chunk_id'][bad]} has dim {rows['dim'][bad]}"
+        )
+    return rows["chunk_id"].tolist(), rows["values"].astype(np.float32)
 
 
 class PostgresDatabaseService:
@@ -29,14 +276,8 @@ class PostgresDatabaseService:
     def _init_database(self):
         """Initialize database connection and create tables"""
         try:
-            # Create engine
-            self.engine = create_engine(
-                self.database_url,
-                echo=False,
-                pool_size=10,
-                max_overflow=20,
-                pool_pre_ping=True,  # Verify connections before using
-            )
+            # Reuse the process-wide engine and its connection pool
+            self.engine = get_db_engine(self.database_url)
 
             # Create session factory
             self.SessionLocal = sessionmaker(
@@ -50,7 +291,7 @@ class PostgresDatabaseService:
 
                 # Check pgvector extension
                 result = conn.execute(
-                    text("SELECT * FROM pg_extension WHERE extname = 'vector'")
+                    text("SELECT 1 FROM pg_extension WHERE extname = 'vector'")
                 )
                 if result.fetchone():
                     log.info("✅ pgvector extension is installed")
@@ -62,110 +303,130 @@ class PostgresDatabaseService:
                     conn.commit()
                     log.info("✅ pgvector extension created")
 
+                self._check_pgvector_version(conn)
+
             # Create tables
             self._create_tables()
+            self._check_embedding_column()
 
         except Exception as e:
             log.error(f"❌ Error initializing database: {e}")
             raise
 
-    def _create_tables(self):
-        """Create database tables if they don't exist"""
-        try:
-            with self.engine.connect() as conn:
-                # Create chunks table
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS chunks (
-                        id SERIAL PRIMARY KEY,
-                        content TEXT NOT NULL,
-                        source_file VARCHAR(255) NOT NULL,
-                        page_number INTEGER,
-                        chunk_index INTEGER NOT NULL,
-                        heading_text TEXT,
-                        heading_level INTEGER,
-                        heading_number VARCHAR(50),
-                        parent_heading TEXT,
-                        is_sub_chunk BOOLEAN DEFAULT FALSE,
-                        sub_chunk_index INTEGER,
-                        total_sub_chunks INTEGER,
-                        chunk_type VARCHAR(50) DEFAULT 'content',
-                        word_count INTEGER,
-                        char_count INTEGER,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
+    @staticmethod
+    def _check_pgvector_version(conn):
+        """Fail fast when the installed pgvector has no halfvec type"""
+        version = conn.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        ).scalar()
+        major_minor = tuple(int(part) for part in version.split(".")[:2])
+        if major_minor < MIN_PGVECTOR_VERSION:
+            raise RuntimeError(
+                f"pgvector {version} has no halfvec type; upgrade to 0.7 or later"
+            )
 
-                # Create embeddings table with pgvector
-                # Use EMBEDDING_DIMENSION from settings (default: 384)
-                from config.settings import EMBEDDING_DIMENSION
+    def _check_embedding_column(self):
+        """
+        Fail fast when embeddings.embedding is not yet halfvec
 
-                conn.execute(
-                    text(
-                        f"""
-                    CREATE TABLE IF NOT EXISTS embeddings (
-                        id SERIAL PRIMARY KEY,
-                        chunk_id INTEGER NOT NULL UNIQUE,
-                        embedding vector({EMBEDDING_DIMENSION}),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (chunk_id) REFERENCES chunks (id) ON DELETE CASCADE
-                    )
-                """
-                    )
+        CREATE TABLE IF NOT EXISTS leaves a table from before the halfvec
+        switch as vector(n), which dense search and get_all_embeddings can
+        no longer read.
+        """
+        with self.engine.connect() as conn:
+            column_type = conn.execute(
+                text(
+                    """
+                SELECT format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = 'embeddings'::regclass
+                  AND attname = 'embedding'
+                  AND NOT attisdropped
+            """
                 )
+            ).scalar()
 
-                # Create conversations table
-                conn.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS conversations (
-                        id SERIAL PRIMARY KEY,
-                        conversation_id VARCHAR(255) NOT NULL,
-                        user_message TEXT NOT NULL,
-                        assistant_response TEXT NOT NULL,
-                        sources TEXT,
-                        confidence FLOAT,
-                        processing_time FLOAT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """
-                    )
-                )
+        if not column_type.startswith("halfvec"):
+            raise RuntimeError(
+                f"embeddings.embedding is {column_type}, not halfvec; run "
+                f"scripts/migrate_embeddings_to_halfvec.py first"
+            )
 
-                # Create indexes
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_chunks_source ON chunks(source_file)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_id ON embeddings(chunk_id)"
-                    )
-                )
-                conn.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS idx_conversations_id ON conversations(conversation_id)"
-                    )
-                )
+    def _create_tables(self):
+        """Create database tables if they don't exist"""
+        try:
+            # Use EMBEDDING_DIMENSION from settings (default: 384)
+            from config.settings import EMBEDDING_DIMENSION
+
+            # All schema statements go out as one script in a single round trip
+            schema_sql = """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id SERIAL PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    source_file TEXT NOT NULL,
+                    page_number INTEGER,
+                    chunk_index INTEGER NOT NULL,
+                    heading_text TEXT,
+                    heading_level INTEGER,
+                    heading_number TEXT,
+                    parent_heading TEXT,
+                    is_sub_chunk BOOLEAN DEFAULT FALSE,
+                    sub_chunk_index INTEGER,
+                    total_sub_chunks INTEGER,
+                    chunk_type TEXT DEFAULT 'content',
+                    word_count INTEGER,
+                    char_count INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id SERIAL PRIMARY KEY,
+                    conversation_id TEXT NOT NULL,
+                    user_message TEXT NOT NULL,
+                    assistant_response TEXT NOT NULL,
+                    sources TEXT,
+                    confidence FLOAT,
+                    processing_time FLOAT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Composite indexes matching the lookups: chunks by
+                -- (source_file, chunk_index) and a conversation's messages in
+                -- created_at order. Their leading columns still serve
+                -- source_file and conversation_id filters, so the
+                -- single-column indexes are dropped, as is the one duplicating
+                -- the UNIQUE index on embeddings.chunk_id
+                CREATE INDEX IF NOT EXISTS idx_chunks_source_index
+                ON chunks(source_file, chunk_index);
+                CREATE INDEX IF NOT EXISTS idx_conversations_id_created
+                ON conversations(conversation_id, created_at);
+                DROP INDEX IF EXISTS idx_chunks_source;
+                DROP INDEX IF EXISTS idx_embeddings_chunk_id;
+                DROP INDEX IF EXISTS idx_conversations_id;
+            """
 
-                # Create vector index for similarity search
-                conn.execute(
-                    text(
-                        """
-                    CREATE INDEX IF NOT EXISTS idx_embeddings_vector 
-                    ON embeddings USING ivfflat (embedding vector_cosine_ops) 
-                    WITH (lists = 100)
-                """
-                    )
+            # Embeddings are stored as half precision, which needs pgvector
+            # 0.7+. Created on its own so an older server still gets the
+            # other tables. Converting an existing vector column and building
+            # the HNSW index rewrite or scan the whole table, so they are left
+            # to scripts/migrate_embeddings_to_halfvec.py
+            embeddings_sql = f"""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    id SERIAL PRIMARY KEY,
+                    chunk_id INTEGER NOT NULL UNIQUE,
+                    embedding halfvec({EMBEDDING_DIMENSION}),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (chunk_id) REFERENCES chunks (id) ON DELETE CASCADE
                 )
+            """
+
+            with self.engine.begin() as conn:
+                conn.execute(text(schema_sql))
+            with self.engine.begin() as conn:
+                conn.execute(text(embeddings_sql))
 
-                conn.commit()
-                log.info("✅ Database tables created successfully")
+            log.info("✅ Database tables created successfully")
 
         except Exception as e:
             log.error(f"❌ Error creating tables: {e}")
@@ -181,61 +442,69 @@ class PostgresDatabaseService:
         Returns:
             List of inserted chunk IDs
         """
-        try:
-            session = self.SessionLocal()
-            chunk_ids = []
+        if not chunks:
+            return []
 
-            for chunk in chunks:
-                # Insert chunk
-                result = session.execute(
-                    text(
-                        """
-                    INSERT INTO chunks (
-                        content, source_file, page_number, chunk_index,
+        rows = [
+            (
+                chunk.content,
+                chunk.source_file,
+                chunk.page_number,
+                chunk.chunk_index,
+                chunk.heading_text,
+                chunk.heading_level,
+                chunk.heading_number,
+                chunk.parent_heading,
+                chunk.is_sub_chunk,
+                chunk.sub_chunk_index,
+                chunk.total_sub_chunks,
+                chunk.chunk_type,
+                chunk.word_count,
+                chunk.char_count,
+            )
+            for chunk in chunks
+        ]
+
+        # COPY streams every row in one statement. IDs are reserved from the
+        # SERIAL sequence up front and written explicitly, so each chunk's ID
+        # is known without RETURNING, which COPY does not support
+        conn = self.engine.raw_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(BULK_LOAD_SETTINGS)
+                cur.execute(
+                    """
+                    SELECT nextval(pg_get_serial_sequence('chunks', 'id'))
+                    FROM generate_series(1, %s)
+                """,
+                    (len(rows),),
+                )
+                chunk_ids = [row[0] for row in cur.fetchall()]
+                cur.copy_expert(
+                    """
+                    COPY chunks (
+                        id, content, source_file, page_number, chunk_index,
                         heading_text, heading_level, heading_number, parent_heading,
                         is_sub_chunk, sub_chunk_index, total_sub_chunks, chunk_type,
                         word_count, char_count
                     )
-                    VALUES (
-                        :content, :source_file, :page_number, :chunk_index,
-                        :heading_text, :heading_level, :heading_number, :parent_heading,
-                        :is_sub_chunk, :sub_chunk_index, :total_sub_chunks, :chunk_type,
-                        :word_count, :char_count
-                    )
-                    RETURNING id
-                """
+                    FROM STDIN
+                """,
+                    _CopyTextStream(
+                        (chunk_id,) + row for chunk_id, row in zip(chunk_ids, rows)
                     ),
-                    {
-                        "content": chunk.content,
-                        "source_file": chunk.source_file,
-                        "page_number": chunk.page_number,
-                        "chunk_index": chunk.chunk_index,
-                        "heading_text": chunk.heading_text,
-                        "heading_level": chunk.heading_level,
-                        "heading_number": chunk.heading_number,
-                        "parent_heading": chunk.parent_heading,
-                        "is_sub_chunk": chunk.is_sub_chunk,
-                        "sub_chunk_index": chunk.sub_chunk_index,
-                        "total_sub_chunks": chunk.total_sub_chunks,
-                        "chunk_type": chunk.chunk_type,
-                        "word_count": chunk.word_count,
-                        "char_count": chunk.char_count,
-                    },
                 )
+            conn.commit()
 
-                chunk_id = result.scalar()
-                chunk_ids.append(chunk_id)
-
-            session.commit()
             log.info(f"✅ Inserted {len(chunks)} chunks into database")
             return chunk_ids
 
         except Exception as e:
-            session.rollback()
+            conn.rollback()
             log.error(f"❌ Error inserting chunks: {e}")
             raise
         finally:
-            session.close()
+            conn.close()
 
     def insert_embeddings(self, chunk_ids: List[int], embeddings: np.ndarray):
         """
@@ -247,34 +516,60 @@ class PostgresDatabaseService:
         """
         if len(chunk_ids) != len(embeddings):
             raise ValueError("Number of chunk IDs must match number of embeddings")
+        if len(embeddings) == 0:
+            return
 
-        try:
-            session = self.SessionLocal()
+        from config.settings import EMBEDDING_DIMENSION
 
-            for chunk_id, embedding in zip(chunk_ids, embeddings):
-                # Convert numpy array to list for pgvector
-                embedding_list = embedding.tolist()
+        embeddings = np.asarray(embeddings)
+        if embeddings.shape[1] != EMBEDDING_DIMENSION:
+            raise ValueError(
+                f"Embedding dimension {embeddings.shape[1]} does not match "
+                f"halfvec({EMBEDDING_DIMENSION})"
+            )
 
-                session.execute(
-                    text(
-                        """
+        # Keyed by chunk ID because one ON CONFLICT DO UPDATE statement may
+        # not touch the same row twice; the last embedding wins as before
+        latest = dict(zip(chunk_ids, range(len(chunk_ids))))
+        buffer = _copy_binary_embeddings(
+            list(latest.keys()), embeddings[list(latest.values())]
+        )
+
+        # COPY streams every row in one command with no per-row statement
+        # parsing; a staging table keeps the upsert that COPY cannot do itself
+        conn = self.engine.raw_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(BULK_LOAD_SETTINGS)
+                cur.execute(
+                    f"""
+                    CREATE TEMP TABLE embeddings_staging (
+                        chunk_id INTEGER,
+                        embedding halfvec({EMBEDDING_DIMENSION})
+                    ) ON COMMIT DROP
+                """
+                )
+                cur.copy_expert(
+                    "COPY embeddings_staging (chunk_id, embedding) "
+                    "FROM STDIN WITH (FORMAT binary)",
+                    buffer,
+                )
+                cur.execute(
+                    """
                     INSERT INTO embeddings (chunk_id, embedding)
-                    VALUES (:chunk_id, :embedding)
-                    ON CONFLICT (chunk_id) DO UPDATE SET embedding = :embedding
+                    SELECT chunk_id, embedding FROM embeddings_staging
+                    ON CONFLICT (chunk_id) DO UPDATE SET embedding = EXCLUDED.embedding
                 """
-                    ),
-                    {"chunk_id": chunk_id, "embedding": embedding_list},
                 )
-
-            session.commit()
+            conn.commit()
             log.info(f"✅ Inserted {len(embeddings)} embeddings into database")
 
         except Exception as e:
-            session.rollback()
+            conn.rollback()
             log.error(f"❌ Error inserting embeddings: {e}")
             raise
         finally:
-            session.close()
+            conn.close()
 
     def get_chunk_count(self) -> int:
         """Get the total number of chunks in database"""
@@ -334,29 +629,33 @@ class PostgresDatabaseService:
         Returns:
             Tuple of (chunk_ids, embeddings_array)
         """
+        from config.settings import EMBEDDING_DIMENSION
+
+        # Binary COPY hands back pgvector's own wire format, which decodes
+        # straight into numpy instead of parsing a text literal per row
+        conn = self.engine.raw_connection()
         try:
-            session = self.SessionLocal()
-            result = session.execute(
-                text(
+            buffer = io.BytesIO()
+            with conn.cursor() as cur:
+                cur.copy_expert(
                     """
-                SELECT chunk_id, embedding
-                FROM embeddings
-                ORDER BY chunk_id
-            """
+                    COPY (
+                        SELECT chunk_id, embedding
+                        FROM embeddings
+                        WHERE embedding IS NOT NULL
+                        ORDER BY chunk_id
+                    )
+                    TO STDOUT WITH (FORMAT binary)
+                """,
+                    buffer,
                 )
-            )
+            conn.commit()
 
-            chunk_ids = []
-            embeddings = []
-
-            for chunk_id, embedding in result.fetchall():
-                chunk_ids.append(chunk_id)
-                # embedding is already a list from pgvector
-                embeddings.append(np.array(embedding, dtype=np.float32))
-
-            if embeddings:
-                embeddings_array = np.vstack(embeddings)
-            else:
+            # Raises if the column holds another dimension than configured
+            chunk_ids, embeddings_array = _read_binary_embeddings(
+                buffer.getbuffer(), EMBEDDING_DIMENSION
+            )
+            if not chunk_ids:
                 embeddings_array = np.array([])
 
             return chunk_ids, embeddings_array
@@ -365,7 +664,7 @@ class PostgresDatabaseService:
             log.error(f"❌ Error getting embeddings: {e}")
             raise
         finally:
-            session.close()
+            conn.close()
 
     def delete_chunks_by_file(self, source_file: str) -> bool:
         """Delete all chunks and their embeddings for a specific file"""
@@ -403,12 +702,50 @@ class PostgresDatabaseService:
             session.close()
 
     def clear_all_data(self):
-        """Clear all data from database"""
+        """
+        Clear all chunks and embeddings from database
+
+        Tables that reference chunks, such as chunk_performance, are never
+        emptied here. While they hold rows for existing chunks this raises
+        RuntimeError, and nothing is cleared.
+        """
         try:
             session = self.SessionLocal()
 
-            session.execute(text("DELETE FROM embeddings"))
-            session.execute(text("DELETE FROM chunks"))
+            # Tables other than embeddings that reference chunks, such as
+            # chunk_performance and chunk_attachments
+            dependents = (
+                session.execute(
+                    text(
+                        """
+                    SELECT DISTINCT conrelid::regclass::text
+                    FROM pg_constraint
+                    WHERE contype = 'f'
+                      AND confrelid = 'chunks'::regclass
+                      AND conrelid <> 'embeddings'::regclass
+                """
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+            if not dependents:
+                # One TRUNCATE frees the tables outright instead of deleting
+                # row by row and leaving dead tuples for VACUUM
+                session.execute(text("TRUNCATE TABLE embeddings, chunks"))
+            else:
+                # TRUNCATE would have to CASCADE into the dependent tables and
+                # wipe their history. DELETE fails instead while they still
+                # reference chunks, leaving the caller to decide about them
+                session.execute(text("DELETE FROM embeddings"))
+                try:
+                    session.execute(text("DELETE FROM chunks"))
+                except IntegrityError as e:
+                    raise RuntimeError(
+                        f"Chunks are still referenced by {', '.join(dependents)}; "
+                        f"clear or archive those rows before clearing all data"
+                    ) from e
 
             session.commit()
             log.info("✅ Cleared all data from database")
@@ -473,18 +810,18 @@ class PostgresDatabaseService:
         try:
             session = self.SessionLocal()
 
-            # Count chunks
-            chunk_count = session.execute(text("SELECT COUNT(*) FROM chunks")).scalar()
-
-            # Count embeddings
-            embedding_count = session.execute(
-                text("SELECT COUNT(*) FROM embeddings")
-            ).scalar()
-
-            # Count unique source files
-            file_count = session.execute(
-                text("SELECT COUNT(DISTINCT source_file) FROM chunks")
-            ).scalar()
+            # All three counts in one round trip; chunks is scanned once
+            chunk_count, file_count, embedding_count = session.execute(
+                text(
+                    """
+                SELECT
+                    COUNT(*),
+                    COUNT(DISTINCT source_file),
+                    (SELECT COUNT(*) FROM embeddings)
+                FROM chunks
+            """
+                )
+            ).one()
 
             return {
                 "total_chunks": chunk_count,
@@ -634,8 +971,6 @@ class PostgresDatabaseService:
             conversations = []
             for row in rows:
                 # Determine status based on last activity
-                from datetime import datetime
-
                 last_message = row[3]
                 is_active = (
                     datetime.now() - last_message
@@ -801,35 +1136,30 @@ class PostgresDatabaseService:
         try:
             session = self.SessionLocal()
 
-            # Total conversations
-            total_conversations = session.execute(
-                text("SELECT COUNT(DISTINCT conversation_id) FROM conversations")
-            ).scalar()
-
-            # Total messages
-            total_messages = session.execute(
-                text("SELECT COUNT(*) FROM conversations")
-            ).scalar()
-
-            # Today's conversations
-            today_conversations = session.execute(
+            # Counts and averages in one round trip and one scan of the table
+            (
+                total_conversations,
+                total_messages,
+                today_conversations,
+                active_conversations,
+                avg_confidence,
+                avg_processing_time,
+            ) = session.execute(
                 text(
                     """
-                SELECT COUNT(DISTINCT conversation_id) FROM conversations
-                WHERE DATE(created_at) = CURRENT_DATE
+                SELECT
+                    COUNT(DISTINCT conversation_id),
+                    COUNT(*),
+                    COUNT(DISTINCT conversation_id)
+                        FILTER (WHERE DATE(created_at) = CURRENT_DATE),
+                    COUNT(DISTINCT conversation_id)
+                        FILTER (WHERE created_at > NOW() - INTERVAL '30 minutes'),
+                    AVG(confidence),
+                    AVG(processing_time)
+                FROM conversations
             """
                 )
-            ).scalar()
-
-            # Average confidence
-            avg_confidence = session.execute(
-                text("SELECT AVG(confidence) FROM conversations")
-            ).scalar()
-
-            # Average processing time
-            avg_processing_time = session.execute(
-                text("SELECT AVG(processing_time) FROM conversations")
-            ).scalar()
+            ).one()
 
             # Popular topics (based on first message keywords)
             popular_topics = session.execute(
@@ -853,16 +1183,6 @@ class PostgresDatabaseService:
                 )
             ).fetchall()
 
-            # Active conversations (last 30 minutes)
-            active_conversations = session.execute(
-                text(
-                    """
-                SELECT COUNT(DISTINCT conversation_id) FROM conversations
-                WHERE created_at > NOW() - INTERVAL '30 minutes'
-            """
-                )
-            ).scalar()
-
             return {
                 "total_conversations": total_conversations or 0,
                 "total_messages": total_messages or 0,
@@ -889,45 +1209,99 @@ class PostgresDatabaseService:
         finally:
             session.close()
 
-    def export_conversations(
-        self, start_date: str = None, end_date: str = None
-    ) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _conversation_export_filter(
+        start_date: str = None, end_date: str = None, as_of: datetime = None
+    ) -> Tuple[str, Dict[str, Any]]:
         """
-        Export conversations for a date range
+        Build the WHERE clause shared by the conversation export queries
 
         Args:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
+            as_of: Ignore messages created after this time
 
         Returns:
-            List of all conversations with messages
+            Tuple of (WHERE clause or empty string, query parameters)
         """
-        try:
-            session = self.SessionLocal()
-            import json
+        conditions = []
+        params = {}
 
-            query = """
-                SELECT conversation_id, user_message, assistant_response, 
-                       sources, confidence, processing_time, created_at
-                FROM conversations
-            """
-            params = {}
+        if start_date and end_date:
+            conditions.append("DATE(created_at) BETWEEN :start_date AND :end_date")
+            params["start_date"] = start_date
+            params["end_date"] = end_date
 
-            if start_date and end_date:
-                query += " WHERE DATE(created_at) BETWEEN :start_date AND :end_date"
-                params["start_date"] = start_date
-                params["end_date"] = end_date
+        if as_of is not None:
+            conditions.append("created_at <= :as_of")
+            params["as_of"] = as_of
 
-            query += " ORDER BY conversation_id, created_at"
+        if not conditions:
+            return "", params
+        return " WHERE " + " AND ".join(conditions), params
 
-            result = session.execute(text(query), params)
-            rows = result.fetchall()
+    def count_conversations(
+        self, start_date: str = None, end_date: str = None, as_of: datetime = None
+    ) -> int:
+        """
+        Count the conversations iter_conversations would yield
 
-            conversations = {}
-            for row in rows:
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            as_of: Ignore messages created after this time
+
+        Returns:
+            Number of distinct conversations
+        """
+        where, params = self._conversation_export_filter(start_date, end_date, as_of)
+
+        with self.engine.connect() as conn:
+            query = "SELECT COUNT(DISTINCT conversation_id) FROM conversations"
+            return conn.execute(text(query + where), params).scalar()
+
+    def iter_conversations(
+        self, start_date: str = None, end_date: str = None, as_of: datetime = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream conversations for a date range, one conversation at a time
+
+        Rows are read through a server-side cursor EXPORT_FETCH_SIZE at a
+        time, and rows arrive grouped by conversation_id, so each
+        conversation is yielded once its last message is read. Memory stays
+        flat however many conversations the range holds.
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            as_of: Ignore messages created after this time, so the result
+                matches a count_conversations call with the same arguments
+
+        Yields:
+            Conversations with their messages
+        """
+        import json
+
+        query = """
+            SELECT conversation_id, user_message, assistant_response, 
+                   sources, confidence, processing_time, created_at
+            FROM conversations
+        """
+        where, params = self._conversation_export_filter(start_date, end_date, as_of)
+        query += where + " ORDER BY conversation_id, created_at"
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=EXPORT_FETCH_SIZE
+            ).execute(text(query), params)
+
+            conversation = None
+            for row in result:
                 conv_id = row[0]
-                if conv_id not in conversations:
-                    conversations[conv_id] = {
+                if conversation is None or conversation["conversation_id"] != conv_id:
+                    if conversation is not None:
+                        yield conversation
+                    conversation = {
                         "conversation_id": conv_id,
                         "messages": [],
                     }
@@ -939,7 +1313,7 @@ class PostgresDatabaseService:
                     except:
                         sources = []
 
-                conversations[conv_id]["messages"].append(
+                conversation["messages"].append(
                     {
                         "user_message": row[1],
                         "assistant_response": row[2],
@@ -950,13 +1324,28 @@ class PostgresDatabaseService:
                     }
                 )
 
-            return list(conversations.values())
+            if conversation is not None:
+                yield conversation
+
+    def export_conversations(
+        self, start_date: str = None, end_date: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Export conversations for a date range
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+
+        Returns:
+            List of all conversations with messages
+        """
+        try:
+            return list(self.iter_conversations(start_date, end_date))
 
         except Exception as e:
             log.error(f"❌ Error exporting conversations: {e}")
             return []
-        finally:
-            session.close()
 
     def close(self):
         """Close database connection"""
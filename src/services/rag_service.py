@@ -5,6 +5,7 @@ RAG (Retrieval-Augmented Generation) service
 import uuid
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from src.services.embedding_service import EmbeddingService
 from src.services.postgres_database_service import PostgresDatabaseService
@@ -25,14 +26,20 @@ from config.settings import (
     ENABLE_GEMINI_NORMALIZATION,
 )
 
+# Shared by all health checks instead of a new pool per request; one worker
+# per probe
+_HEALTH_PROBE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=3, thread_name_prefix="health-probe"
+)
+
 
 class RAGService:
     """Service for Retrieval-Augmented Generation"""
 
-    def __init__(self, analytics_service=None):
+    def __init__(self, analytics_service=None, db_service=None):
         """Initialize RAG service with PostgreSQL + Hybrid Retrieval"""
         self.embedding_service = EmbeddingService()
-        self.db_service = PostgresDatabaseService()
+        self.db_service = db_service or PostgresDatabaseService()
         self.retrieval_service = HybridRetrievalService(
             self.db_service, self.embedding_service
         )
@@ -1489,13 +1496,23 @@ Trả lời / Response:"""
         """
         health_status = {"overall_status": "healthy", "components": {}}
 
+        # The Ollama, database and embedding probes are independent and mostly
+        # wait on I/O or native code, so run them concurrently
+        ollama_future = _HEALTH_PROBE_EXECUTOR.submit(self.ollama_service.check_health)
+        db_stats_future = _HEALTH_PROBE_EXECUTOR.submit(
+            self.db_service.get_database_stats
+        )
+        embedding_dim_future = _HEALTH_PROBE_EXECUTOR.submit(
+            self.embedding_service.get_embedding_dimension
+        )
+
         # Check Ollama
-        ollama_health = self.ollama_service.check_health()
+        ollama_health = ollama_future.result()
         health_status["components"]["ollama"] = ollama_health
 
         # Check PostgreSQL + pgvector
         try:
-            db_stats = self.db_service.get_database_stats()
+            db_stats = db_stats_future.result()
             health_status["components"]["database"] = {
                 "status": "healthy",
                 "stats": db_stats,
@@ -1520,7 +1537,7 @@ Trả lời / Response:"""
 
         # Check embedding service
         try:
-            embedding_dim = self.embedding_service.get_embedding_dimension()
+            embedding_dim = embedding_dim_future.result()
             health_status["components"]["embedding"] = {
                 "status": "healthy",
                 "dimension": embedding_dim,
@@ -2,11 +2,16 @@
 Module for chunking text based on headings and sections
 """
 
+import heapq
 import re
+from collections import Counter
 from typing import List, Dict, Any, Optional
 from src.models.schemas import DocumentChunk
 from src.utils.logger import log
 
+# Oversized/undersized chunks listed individually in analyze_chunks reports
+MAX_REPORTED_CHUNKS = 10
+
 
 class HeadingChunker:
     """
@@ -565,10 +570,8 @@ class HeadingChunker:
         if not chunks:
             return {}
 
-        char_counts = [chunk.char_count or len(chunk.content) for chunk in chunks]
-        word_counts = [
-            chunk.word_count or len(chunk.content.split()) for chunk in chunks
-        ]
+        char_counts = [chunk.char_count for chunk in chunks]
+        word_counts = [chunk.word_count for chunk in chunks]
 
         analysis = {
             "total_chunks": len(chunks),
@@ -580,42 +583,38 @@ class HeadingChunker:
             "max_char_count": max(char_counts),
             "min_word_count": min(word_counts),
             "max_word_count": max(word_counts),
-            "chunks_by_type": {},
-            "chunks_by_heading_level": {},
-            "large_chunks": [],
-            "small_chunks": [],
+            # Counter tallies in C rather than with a per-chunk dict update
+            "chunks_by_type": dict(Counter(chunk.chunk_type for chunk in chunks)),
+            "chunks_by_heading_level": dict(
+                Counter(chunk.heading_level for chunk in chunks if chunk.heading_level)
+            ),
+            "large_chunk_count": sum(c > self.max_chunk_size for c in char_counts),
+            "small_chunk_count": sum(c < self.min_chunk_size for c in char_counts),
         }
 
-        # Analyze by type and level
-        for chunk in chunks:
-            chunk_type = chunk.chunk_type
-            analysis["chunks_by_type"][chunk_type] = (
-                analysis["chunks_by_type"].get(chunk_type, 0) + 1
+        # Report only the worst offenders; the heap selection keeps memory
+        # bounded however many chunks are out of range
+        def describe(i: int) -> Dict[str, Any]:
+            return {
+                "chunk_index": chunks[i].chunk_index,
+                "heading": chunks[i].heading_text,
+                "char_count": char_counts[i],
+            }
+
+        large = (i for i, c in enumerate(char_counts) if c > self.max_chunk_size)
+        small = (i for i, c in enumerate(char_counts) if c < self.min_chunk_size)
+        analysis["large_chunks"] = [
+            describe(i)
+            for i in heapq.nlargest(
+                MAX_REPORTED_CHUNKS, large, key=char_counts.__getitem__
             )
-
-            if chunk.heading_level:
-                level = chunk.heading_level
-                analysis["chunks_by_heading_level"][level] = (
-                    analysis["chunks_by_heading_level"].get(level, 0) + 1
-                )
-
-            char_count = chunk.char_count or len(chunk.content)
-            if char_count > self.max_chunk_size:
-                analysis["large_chunks"].append(
-                    {
-                        "chunk_index": chunk.chunk_index,
-                        "heading": chunk.heading_text,
-                        "char_count": char_count,
-                    }
-                )
-            elif char_count < self.min_chunk_size:
-                analysis["small_chunks"].append(
-                    {
-                        "chunk_index": chunk.chunk_index,
-                        "heading": chunk.heading_text,
-                        "char_count": char_count,
-                    }
-                )
+        ]
+        analysis["small_chunks"] = [
+            describe(i)
+            for i in heapq.nsmallest(
+                MAX_REPORTED_CHUNKS, small, key=char_counts.__getitem__
+            )
+        ]
 
         return analysis
 
@@ -632,7 +631,7 @@ class HeadingChunker:
         i = 0
         while i < len(processed_chunks):
             current_chunk = processed_chunks[i]
-            current_size = current_chunk.char_count or len(current_chunk.content)
+            current_size = current_chunk.char_count
 
             if current_size >= self.min_chunk_size:
                 i += 1
@@ -642,7 +641,7 @@ class HeadingChunker:
             # Option 1: Try to merge with the previous chunk
             if i > 0:
                 prev_chunk = processed_chunks[i - 1]
-                prev_size = prev_chunk.char_count or len(prev_chunk.content)
+                prev_size = prev_chunk.char_count
                 combined_size = prev_size + current_size
 
                 if combined_size <= self.max_chunk_size and self._can_merge_chunks(
@@ -661,7 +660,7 @@ class HeadingChunker:
             # Option 2: Try to merge with the next chunk
             if i < len(processed_chunks) - 1:
                 next_chunk = processed_chunks[i + 1]
-                next_size = next_chunk.char_count or len(next_chunk.content)
+                next_size = next_chunk.char_count
                 combined_size = current_size + next_size
 
                 if combined_size <= self.max_chunk_size and self._can_merge_chunks(
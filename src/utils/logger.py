@@ -20,14 +20,16 @@ def setup_logger():
         colorize=True
     )
 
-    # Add file logger
+    # Add file logger; enqueue hands records to a background writer so
+    # request handlers never block on the log file
     logger.add(
         LOG_FILE,
         level=LOG_LEVEL,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         rotation="10 MB",
         retention="7 days",
-        compression="zip"
+        compression="zip",
+        enqueue=True
     )
 
     return logger
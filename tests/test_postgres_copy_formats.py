@@ -0,0 +1,230 @@
+"""
+Tests for the COPY stream encoders and decoders of the PostgreSQL service
+"""
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.services.postgres_database_service import (
+    COPY_BINARY_HEADER,
+    _CopyTextStream,
+    _copy_binary_embeddings,
+    _read_binary_embeddings,
+)
+
+
+def _halfvec_row(chunk_id: int, values: np.ndarray) -> bytes:
+    """Encode one (chunk_id, halfvec) row field by field, as the server does"""
+    vector = struct.pack(">hh", len(values), 0) + values.astype(">f2").tobytes()
+    return (
+        struct.pack(">h", 2)
+        + struct.pack(">ii", 4, chunk_id)
+        + struct.pack(">i", len(vector))
+        + vector
+    )
+
+
+def _unescape_copy_field(field: str):
+    """Reverse COPY text escaping for the sequences _CopyTextStream writes"""
+    if field == "\\N":
+        return None
+    escapes = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+    out = []
+    chars = iter(field)
+    for char in chars:
+        out.append(escapes[next(chars)] if char == "\\" else char)
+    return "".join(out)
+
+
+class TestBinaryEmbeddingCopy:
+    """Test cases for the pgvector halfvec binary COPY format"""
+
+    def test_round_trip(self):
+        """Encoded rows decode back to the same chunk IDs and vectors"""
+        rng = np.random.default_rng(0)
+        # Values exactly representable in half precision survive unchanged
+        embeddings = rng.standard_normal((5, 16)).astype(np.float16)
+        chunk_ids = [3, 1, 4, 15, 92]
+
+        payload = _copy_binary_embeddings(chunk_ids, embeddings).getvalue()
+        decoded_ids, decoded = _read_binary_embeddings(payload, 16)
+
+        assert decoded_ids == chunk_ids
+        assert decoded.dtype == np.float32
+        np.testing.assert_array_equal(decoded, embeddings.astype(np.float32))
+
+    def test_float32_input_is_rounded_to_half_precision(self):
+        """float32 vectors are stored as their nearest float16 values"""
+        embeddings = np.random.default_rng(1).random((3, 8), dtype=np.float32)
+
+        payload = _copy_binary_embeddings([1, 2, 3], embeddings).getvalue()
+        _, decoded = _read_binary_embeddings(payload, 8)
+
+        np.testing.assert_array_equal(
+            decoded, embeddings.astype(np.float16).astype(np.float32)
+        )
+
+    def test_stream_layout(self):
+        """Header, row fields and trailer match the PGCOPY and halfvec formats"""
+        values = np.array([[1.0, -2.0, 0.5]], dtype=np.float32)
+
+        payload = _copy_binary_embeddings([7], values).getvalue()
+
+        assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+        assert payload[: len(COPY_BINARY_HEADER)] == COPY_BINARY_HEADER
+        assert struct.unpack_from(">ii", payload, 11) == (0, 0)
+        assert payload[len(COPY_BINARY_HEADER) : -2] == _halfvec_row(7, values[0])
+        assert payload[-2:] == struct.pack(">h", -1)
+
+    def test_server_encoded_rows_decode(self):
+        """Rows built field by field, as the server sends them, decode"""
+        values = np.array([[0.25, 0.5], [1.0, -1.0]], dtype=np.float32)
+        payload = (
+            COPY_BINARY_HEADER
+            + _halfvec_row(10, values[0])
+            + _halfvec_row(11, values[1])
+            + struct.pack(">h", -1)
+        )
+
+        chunk_ids, decoded = _read_binary_embeddings(payload, 2)
+
+        assert chunk_ids == [10, 11]
+        np.testing.assert_array_equal(decoded, values)
+
+    def test_header_extension_is_skipped(self):
+        """A non-empty header extension area is skipped before the rows"""
+        values = np.array([[0.5, 2.0]], dtype=np.float32)
+        extension = b"\x01\x02\x03"
+        payload = (
+            COPY_BINARY_HEADER[:-4]
+            + struct.pack(">i", len(extension))
+            + extension
+            + _halfvec_row(5, values[0])
+            + struct.pack(">h", -1)
+        )
+
+        chunk_ids, decoded = _read_binary_embeddings(payload, 2)
+
+        assert chunk_ids == [5]
+        np.testing.assert_array_equal(decoded, values)
+
+    def test_empty_stream(self):
+        """A stream without rows decodes to no chunk IDs"""
+        payload = _copy_binary_embeddings(
+            [], np.zeros((0, 4), dtype=np.float32)
+        ).getvalue()
+
+        chunk_ids, decoded = _read_binary_embeddings(payload, 4)
+
+        assert payload == COPY_BINARY_HEADER + struct.pack(">h", -1)
+        assert chunk_ids == []
+        assert decoded.shape == (0, 4)
+
+    def test_dimension_mismatch_is_rejected(self):
+        """Rows of another dimension raise instead of being misparsed"""
+        embeddings = np.ones((4, 8), dtype=np.float32)
+        payload = _copy_binary_embeddings([1, 2, 3, 4], embeddings).getvalue()
+
+        for dim in (4, 16):
+            with pytest.raises(ValueError, match="halfvec"):
+                _read_binary_embeddings(payload, dim)
+
+    def test_mixed_dimensions_are_rejected(self):
+        """A later row whose header dim differs from the first raises"""
+        # Only the dim field is changed, so the stream length still looks
+        # right and only the per-row header check can catch it
+        good = _halfvec_row(1, np.array([1.0, 2.0], dtype=np.float32))
+        bad = bytearray(_halfvec_row(2, np.array([3.0, 4.0], dtype=np.float32)))
+        struct.pack_into(">h", bad, 14, 3)
+        payload = COPY_BINARY_HEADER + good + bytes(bad) + struct.pack(">h", -1)
+
+        with pytest.raises(ValueError, match="chunk 2"):
+            _read_binary_embeddings(payload, 2)
+
+    def test_null_embedding_is_rejected(self):
+        """A NULL embedding field (length -1) raises instead of being read"""
+        values = np.array([1.0, 2.0], dtype=np.float32)
+        null_row = struct.pack(">hiii", 2, 4, 9, -1)
+        # Pad with a valid row so the stream length alone does not give it away
+        payload = (
+            COPY_BINARY_HEADER
+            + _halfvec_row(8, values)
+            + null_row
+            + _halfvec_row(10, values)[len(null_row) :]
+            + struct.pack(">h", -1)
+        )
+
+        with pytest.raises(ValueError):
+            _read_binary_embeddings(payload, 2)
+
+    def test_missing_trailer_is_rejected(self):
+        """A truncated stream without the -1 trailer raises"""
+        embeddings = np.ones((2, 4), dtype=np.float32)
+        payload = _copy_binary_embeddings([1, 2], embeddings).getvalue()
+
+        with pytest.raises(ValueError, match="trailer"):
+            _read_binary_embeddings(payload[:-2], 4)
+
+
+class TestCopyTextStream:
+    """Test cases for the COPY text format chunk stream"""
+
+    ROWS = [
+        (1, "plain text", "a.pdf", 3, None),
+        (2, "tab\there", "b.pdf", None, "x"),
+        (3, "line\nbreak\r\nand \\ backslash", "c d.pdf", 1, ""),
+        (4, "tiếng Việt", "đ.pdf", 0, "\\N"),
+    ]
+
+    def _parse(self, data: str):
+        """Split COPY text lines back into rows of unescaped fields"""
+        return [
+            tuple(_unescape_copy_field(field) for field in line.split("\t"))
+            for line in data.split("\n")[:-1]
+        ]
+
+    def test_round_trip(self):
+        """Formatted rows parse back to their string values and NULLs"""
+        data = _CopyTextStream(self.ROWS).read()
+
+        expected = [
+            tuple(None if value is None else str(value) for value in row)
+            for row in self.ROWS
+        ]
+        assert self._parse(data) == expected
+
+    def test_null_and_literal_backslash_n(self):
+        """None is written as \\N while the text '\\N' is escaped"""
+        line = _CopyTextStream([(None, "\\N")]).read()
+
+        assert line == "\\N\t\\\\N\n"
+
+    def test_sized_reads_match_full_read(self):
+        """Reading in small blocks yields the same payload as one read"""
+        full = _CopyTextStream(self.ROWS).read()
+
+        for size in (1, 7, 64):
+            stream = _CopyTextStream(self.ROWS)
+            blocks = []
+            while True:
+                block = stream.read(size)
+                if not block:
+                    break
+                assert len(block) <= size
+                blocks.append(block)
+            assert "".join(blocks) == full
+
+    def test_empty_rows(self):
+        """A stream without rows reads as empty"""
+        stream = _CopyTextStream([])
+
+        assert stream.readable()
+        assert stream.read(8192) == ""
+        assert stream.read() == ""